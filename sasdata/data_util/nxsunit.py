@@ -45,17 +45,56 @@ inferring the dimension from an example unit.
 
 import math
 import re
+import threading
+from functools import lru_cache
 from typing import Dict, Union, TypeVar, Tuple, Sequence, Optional, List
 
 __all__ = ['Converter', 'standardize_units']
 T = TypeVar('T')
 ConversionType = Union[float, Tuple[float, float]]
-DIMENSIONS = {}  # type: Dict[str, Dict[str, ConversionType]]
+DIMENSIONS = {}  # type: Dict[str, Dict[str, Tuple[float, float]]]
 AMBIGUITIES = {}  # type: Dict[str, str]
+_UNIT_TO_DIM = {}  # type: Dict[str, str]
 PREFIX = dict(peta=1e15, tera=1e12, giga=1e9, mega=1e6, kilo=1e3, deci=1e-1, centi=1e-2, milli=1e-3, mili=1e-3,
               micro=1e-6, nano=1e-9, pico=1e-12, femto=1e-15)
 SHORT_PREFIX = dict(P=1e15, T=1e12, G=1e9, M=1e6, k=1e3, d=1e-1, c=1e-2, m=1e-3, u=1e-6, n=1e-9, p=1e-12, f=1e-15)
 
+# Named (pattern, replacement) pairs recognised by standardize_units
+_NAMED_PATS = [
+    # Catch ang, angstrom, ANG, ANGSTROM, and any capitalization in between
+    # Replace with 'Å'
+    ('ang', r'[ÅAa]ng(str[oö]m)?(s)?', 'Å'),
+    # Catch meter, metre, METER, METRE, and any capitalization in between
+    # Replace with 'm'
+    ('met', r'(met(er|re)(s)?)', 'm'),
+    # Catch second, sec, SECOND, SEC, and any capitalization in between
+    # Replace with 's'
+    ('sec', r'sec(ond)?(s)?', 's'),
+    # Catch kelvin, KELVIN, and any capitalization in between
+    # Replace with 'K'
+    ('kel', r'kel(vin)?(s)?', 'K'),
+    # Catch celcius, CELCIUS, and any capitalization in between
+    # Replace with '℃'
+    ('cel', r'cel(cius)?', '℃'),
+    # Catch hertz, HERTZ, hz, HZ, and any capitalization in between
+    # Replace with 'Hz'
+    ('hz', r'h(ert)?z', 'Hz'),
+    # Catch arbitrary units, arbitrary, and any capitalization
+    # Replace with 'a.u.'
+    ('arb', r'(arb(itrary|[.]|)?( )?(units)?|a[.] ?u[.]|au[.]?|aus[.]?)', 'a.u.'),
+    ('unk', r'(unk)(nown)?', 'Unk'),
+    ('cts', r'(c)(oun)?(t)(s)?', 'cts'),
+]
+# All of the above fused into a single alternation so the unit string is only scanned once
+_STD_ALL = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern, _ in _NAMED_PATS), re.IGNORECASE)
+_STD_REPL = {name: replacement for name, _, replacement in _NAMED_PATS}
+# Pre-compiled patterns used by _format_unit_structure
+_RE_EXPONENT = re.compile('([℃ÅA-Za-z_ ]+)([-0-9]+)')
+_RE_INVERSE = [re.compile(x, re.IGNORECASE) for x in ['inv', '1/']]
+# centi*metre -> centimetre for every known prefix, trying the longest prefixes first
+_RE_PREFIX_STAR = re.compile(
+    '(' + '|'.join(map(re.escape, sorted((*PREFIX, *SHORT_PREFIX), key=len, reverse=True))) + r')\*')
+
 
 # Limited form of units for returning objects of a specific type.
 # Maybe want to do full units handling with e.g., pyre's
@@ -75,17 +114,16 @@ def _build_metric_units(unit: str, abbr: str) -> Dict[str, float]:
     Returns a dictionary of names and scales.
     """
     units = {}
-    for name in [unit, unit.capitalize(), unit.lower(), abbr]:
-        for items in [PREFIX, SHORT_PREFIX]:
-            names = {}
-            names.update({name: 1})
-            names.update([(P + name, scale) for (P, scale) in items.items()])
-            names.update([(P + '*' + name, scale) for (P, scale) in items.items()])
-            names.update([(P + '_' + name, scale) for (P, scale) in items.items()])
-            # Exclude pluralized abbrevs., e.g. create m(illi)(?)(*|_)(?)meters, but not milli(*|_)(?)ms or m(*|_)(?)ms
-            if name != abbr:
-                names.update(_build_plural_units(**names))
-            units.update(names)
+    for name in (unit, unit.capitalize(), unit.lower(), abbr):
+        names = {name: 1}
+        for prefixes in (PREFIX, SHORT_PREFIX):
+            for prefix, scale in prefixes.items():
+                for sep in ('', '*', '_'):
+                    names[prefix + sep + name] = scale
+        # Exclude pluralized abbrevs., e.g. create m(illi)(?)(*|_)(?)meters, but not milli(*|_)(?)ms or m(*|_)(?)ms
+        if name != abbr:
+            names.update([(singular + 's', scale) for singular, scale in list(names.items())])
+        units.update(names)
     return units
 
 
@@ -264,6 +302,14 @@ def _build_all_units():
     )
     DIMENSIONS['dimensionless'] = unknown
 
+    # Normalize every conversion to a (scale, offset) pair so lookups never need a type check, and build the reverse
+    # lookup of unit name to dimension; the first dimension defining a unit wins
+    for dimension, table in DIMENSIONS.items():
+        for name, conversion in table.items():
+            if not isinstance(conversion, tuple):
+                table[name] = (conversion, 0.0)
+            _UNIT_TO_DIM.setdefault(name, dimension)
+
 
 def standardize_units(unit: Union[str, None]) -> List[str]:
     """
@@ -273,32 +319,21 @@ def standardize_units(unit: Union[str, None]) -> List[str]:
     """
     # Convert value to a string -> Sets None to 'None'
     # Useful for GUI elements that require string values
-    unit = str(unit)
-    # Catch ang, angstrom, ANG, ANGSTROM, and any capitalization in between
-    # Replace with 'Å'
-    unit = re.sub(r'[ÅAa]ng(str[oö]m)?(s)?', 'Å', unit, flags=re.IGNORECASE)
-    # Catch meter, metre, METER, METRE, and any capitalization in between
-    # Replace with 'm'
-    unit = re.sub(r'(met(er|re)(s)?)', 'm', unit, flags=re.IGNORECASE)
-    # Catch second, sec, SECOND, SEC, and any capitalization in between
-    # Replace with 's'
-    unit = re.sub(r'sec(ond)?(s)?', 's', unit, flags=re.IGNORECASE)
-    # Catch kelvin, KELVIN, and any capitalization in between
-    # Replace with 'K'
-    unit = re.sub(r'kel(vin)?(s)?', 'K', unit, flags=re.IGNORECASE)
-    # Catch celcius, CELCIUS, and any capitalization in between
-    # Replace with '℃'
-    unit = re.sub(r'cel(cius)?', '℃', unit, flags=re.IGNORECASE)
-    # Catch hertz, HERTZ, hz, HZ, and any capitalization in between
-    # Replace with 'Hz'
-    unit = re.sub(r'h(ert)?z', 'Hz', unit, flags=re.IGNORECASE)
-    # Catch arbitrary units, arbitrary, and any capitalization
-    # Replace with 'a.u.'
-    unit = re.sub(r'(arb(itrary|[.]|)?( )?(units)?|a[.] ?u[.]|au[.]?|aus[.]?)',
-                  'a.u.', unit, flags=re.IGNORECASE)
-    unit = re.sub(r'(unk)(nown)?', 'Unk', unit, flags=re.IGNORECASE)
-    unit = re.sub(r'(c)(oun)?(t)(s)?', 'cts', unit, flags=re.IGNORECASE)
-    return _format_unit_structure(unit)
+    if not isinstance(unit, str):
+        unit = str(unit)
+    return list(_standardize_units_cached(unit))
+
+
+@lru_cache(maxsize=4096)
+def _standardize_units_cached(unit: str) -> Tuple[str, ...]:
+    """
+    Cached implementation of standardize_units. The result is returned as a tuple so
+    callers cannot mutate the cached value.
+    :param unit: Raw unit string
+    :return: Tuple of standardized unit factors
+    """
+    unit = _STD_ALL.sub(lambda match: _STD_REPL[match.lastgroup], unit)
+    return _format_unit_structure_cached(unit)
 
 
 def _format_unit_structure(unit: Optional[str] = None) -> List[str]:
@@ -309,19 +344,27 @@ def _format_unit_structure(unit: Optional[str] = None) -> List[str]:
     """
     # Convert value to a string -> Sets None to 'None'
     # Useful for GUI elements that require string values
-    unit = str(unit)
+    if not isinstance(unit, str):
+        unit = str(unit)
+    return list(_format_unit_structure_cached(unit))
+
+
+@lru_cache(maxsize=4096)
+def _format_unit_structure_cached(unit: str) -> Tuple[str, ...]:
+    """
+    Cached implementation of _format_unit_structure.
+    :param unit: Unit string to be formatted
+    :return: Tuple of formatted unit factors
+    """
     # a-m[ /?]b-n ... -> a^m b^-n
-    unit = re.sub('([℃ÅA-Za-z_ ]+)([-0-9]+)', r"\1^\2", unit)
+    unit = _RE_EXPONENT.sub(r"\1^\2", unit)
     # centi*metre -> centimetre (before converting * -> ' ')
-    all_prefixes = list(PREFIX.keys())
-    all_prefixes.extend(list(SHORT_PREFIX.keys()))
-    for prefix in all_prefixes:
-        unit = unit.replace(prefix + "*", prefix)
+    unit = _RE_PREFIX_STAR.sub(r'\1', unit)
     # a^-m*b^-n -> a^-m b^-n
     unit = unit.replace('*', ' ')
     # invUnit or 1/unit -> /unit
-    for x in ['inv', '1/']:
-        unit = re.sub(x, '/', unit, flags=re.IGNORECASE)
+    for pattern in _RE_INVERSE:
+        unit = pattern.sub('/', unit)
     # (a_m^2 b_n^-3) -> am^2 bn^-3
     for x in ['_', '(', ')']:
         unit = unit.replace(x, '')
@@ -331,19 +374,121 @@ def _format_unit_structure(unit: Optional[str] = None) -> List[str]:
     for i in range(len(factors)):
         sign = '-' if i > 0 else ''
         for item in factors[i].split():
-            if item == '':
-                continue
             ct_split = item.split('^')
-            f_item = f"{ct_split[0]}"
-            number = 1 if len(ct_split) == 1 else ct_split[1]
-            f_item += (f"^{{{sign}{number}}}" if len(ct_split) > 1 or sign == '-' else " ")
-            final.append(f_item.strip().replace('{{', '{').replace('}}', '}'))
-    # ' am^{{2}} bn^{{-2}} c^{{-1}} ' -> 'am^{2} bn^{-2} c^{-1}'
-    return final
+            if len(ct_split) > 1:
+                number = ct_split[1]
+                # Exponents may already be wrapped in braces, e.g. A^{2}
+                if number.startswith('{') and number.endswith('}'):
+                    number = number[1:-1]
+                final.append(f"{ct_split[0]}^{{{sign}{number}}}")
+            elif sign:
+                final.append(f"{ct_split[0]}^{{-1}}")
+            else:
+                final.append(ct_split[0])
+    return tuple(final)
+
+
+@lru_cache(maxsize=256)
+def _make_scale_with_offset(inscale: float, inoffset: float):
+    """
+    Build the function a Converter uses to scale values from its source units. The source scale and offset are bound
+    as closure variables rather than read from the converter on every call.
+    :param inscale: Scale of the source units
+    :param inoffset: Offset of the source units
+    :return: Function taking the value(s), the (scale, offset) of the target units and an optional output array
+    """
+    # Conversions from units without an offset (anything but temperature) only ever need to be scaled
+    is_pure_scale = inoffset == 0.0
+
+    def scale_with_offset(value: T, scale_base: Tuple[float, float], out: Optional[T] = None) -> T:
+        """Scale the given value and add the offset using the units string supplied"""
+        outscale, outoffset = scale_base
+        if is_pure_scale and outoffset == 0.0:
+            # Only a scale factor to apply, and nothing to do at all when the units are equivalent
+            factor = inscale / outscale
+            if out is None:
+                return value * factor if factor != 1.0 else value
+            out[...] = value
+            if factor != 1.0:
+                out *= factor
+            return out
+        if out is None:
+            return (value + outoffset) * inscale / outscale - inoffset
+        out[...] = value
+        out += outoffset
+        out *= inscale
+        out /= outscale
+        out -= inoffset
+        return out
+
+    return scale_with_offset
+
+
+# DIMENSIONS and AMBIGUITIES are filled in on first use rather than at import time
+_INITIALIZED = False
+_INIT_LOCK = threading.Lock()
+
+
+def _ensure_units():
+    """
+    Initialize DIMENSIONS and AMBIGUITIES if that has not been done yet.
+    """
+    global _INITIALIZED
+    if _INITIALIZED:
+        return
+    with _INIT_LOCK:
+        if not _INITIALIZED:
+            _build_all_units()
+            _INITIALIZED = True
+
+
+def _get_scale_for_units(scalemaps: Sequence[Dict[str, ConversionType]], units: Sequence[str],
+                         source_units: str) -> Tuple[float, float]:
+    """
+    Get the combined scale factor and scale offset of a set of standardized units
+    :param scalemaps: Scale map for the dimension of each unit
+    :param units: Standardized units to find the scale for
+    :param source_units: Units of the converter, used for error reporting
+    :return: (scale, offset) tuple
+    """
+    scale, offset = 1.0, 0.0
+    for scalemap, unit in zip(scalemaps, units):
+        unit_scale = scalemap.get(unit)
+        if unit_scale is None:
+            raise ValueError(f"{list(units)} are not compatible with {source_units}")
+        scale *= unit_scale[0]
+        offset += unit_scale[1]
+    return scale, offset
+
+
+@lru_cache(maxsize=2048)
+def _build_converter_state(units: str, dimension: Optional[Tuple[str, ...]] = None):
+    """
+    Resolve everything a Converter needs to know about its source units. Converters are routinely created for the
+    same handful of units strings, so the result is cached.
+    :param units: Raw source units string
+    :param dimension: Dimension of each unit, if known
+    :return: (standardized units, dimensions, scale maps, scale base, scale offset)
+    """
+    _ensure_units()
+    std_units = _standardize_units_cached(units)
+    if not dimension and len(std_units) == 1:
+        # Most units strings hold a single unit, which needs just one dimension and scale lookup
+        unit = std_units[0]
+        dim = AMBIGUITIES.get(unit) or _UNIT_TO_DIM.get(unit, 'dimensionless')
+        scalemap = DIMENSIONS[dim]
+        unit_scale = scalemap.get(unit)
+        if unit_scale is not None:
+            return std_units, (dim,), (scalemap,), unit_scale[0], unit_scale[1]
+    # Lookup dimension if not given
+    if not dimension:
+        dimension = tuple(AMBIGUITIES.get(unit) or _UNIT_TO_DIM.get(unit, 'dimensionless') for unit in std_units)
+    # Find the scale for the given units - default to dimensionless
+    scalemap = tuple(DIMENSIONS.get(dim, DIMENSIONS['dimensionless']) for dim in dimension)
+    scalebase, scaleoffset = _get_scale_for_units(scalemap, std_units, ' '.join(std_units))
+    return std_units, dimension, scalemap, scalebase, scaleoffset
 
 
-# Initialize DIMENSIONS and AMBIGUITIES
-_build_all_units()
 
 
 class Converter:
@@ -358,8 +503,7 @@ class Converter:
     _units = None  # type: List[str]
     #: Type of the source units (distance, time, frequency, ...)
     dimension = None  # type: List[str]
-    #: Scale converter, mapping unit name to scale factor or (scale, offset)
-    #: for temperature units.
+    #: Scale converter, mapping unit name to (scale, offset)
     scalemap = None  # type: List[Dict[str, ConversionType]]
     #: Scale base for the source units
     scalebase = None  # type: float
@@ -374,74 +518,55 @@ class Converter:
         self._units = standardize_units(unit)
 
     def __init__(self, units: Optional[str] = None, dimension: Optional[List[str]] = None):
-        self.units = units if units is not None else 'a.u.'  # type: str
-
-        # Lookup dimension if not given
-        if dimension:
-            self.dimension = dimension
-        else:
-            self.dimension = []
-            for unit in self._units:
-                if unit in AMBIGUITIES:
-                    self.dimension.append(AMBIGUITIES[self.units])
-                else:
-                    for k, v in DIMENSIONS.items():
-                        if unit in v:
-                            self.dimension.append(k)
-                            break
-                    else:
-                        self.dimension.append('dimensionless')
-
-        # Find the scale for the given units - default to dimensionless
-        self.scalemap = [DIMENSIONS.get(dimension, DIMENSIONS['dimensionless']) for dimension in self.dimension]
-        base = self._get_scale_for_units(self._units)
-        self.scalebase = base[0]
-        self.scaleoffset = base[1]
-
-    def scale(self, units: str = "", value: T = None) -> Union[List[float], T]:
-        """Scale the given value using the units string supplied"""
-        units = standardize_units(units) if units is not None else ['']
-        base = self._get_scale_for_units(units)
-        value = self._scale_with_offset(value, base)
+        units = str(units) if units is not None else 'a.u.'
+        dimension = tuple(dimension) if dimension else None
+        std_units, dims, scalemap, self.scalebase, self.scaleoffset = _build_converter_state(units, dimension)
+        self._units = list(std_units)
+        self.dimension = list(dims)
+        self.scalemap = list(scalemap)
+        # Scaling function with the source scale and offset bound in, for the per-call conversion path
+        self._scale_with_offset = _make_scale_with_offset(self.scalebase, self.scaleoffset)
+        #: (scale, offset) of each target units string this converter has been asked to convert to
+        self._scale_cache = {}  # type: Dict[Optional[str], Tuple[float, float]]
+
+    def scale(self, units: str = "", value: T = None, out: Optional[T] = None) -> Union[List[float], T]:
+        """
+        Scale the given value using the units string supplied
+        :param units: Units to convert the value to
+        :param value: Value, or array of values, in the units of the converter
+        :param out: Optional array to write the converted values into, avoiding a new allocation
+        :return: Converted value(s)
+        """
+        base = self._scale_cache.get(units)
+        if base is None:
+            base = self._get_scale_for_units(standardize_units(units) if units is not None else [''])
+            self._scale_cache[units] = base
+        value = self._scale_with_offset(value, base, out)
         return value
 
-    def _scale_with_offset(self, value: float, scale_base: Tuple[float, float]) -> float:
-        """Scale the given value and add the offset using the units string supplied"""
-        inscale, inoffset = self.scalebase, self.scaleoffset
-        outscale, outoffset = scale_base
-        return (value + outoffset) * inscale / outscale - inoffset
-
     def _get_scale_for_units(self, units: List[str]):
         """Protected method to get scale factor and scale offset as a combined value"""
-        base = (1.0, 0.0)
-        for scalemap, unit in zip(self.scalemap, units):
-            unit_scale = scalemap.get(unit)
-            if unit_scale is None:
-                raise ValueError(f"{units} are not compatible with {self.units}")
-            if not isinstance(unit_scale, tuple):
-                unit_scale = (unit_scale, 0.0)
-            base = (base[0] * unit_scale[0], base[1] + unit_scale[1])
-        return base
+        return _get_scale_for_units(self.scalemap, units, self.units)
 
     def get_compatible_units(self) -> List[str]:
         """Return a list of compatible units for the current Convertor object"""
-        unique_units = []
-        conv_list = []
+        # Map each standardized unit to the conversion of the first name that produced it
+        compatible = {}
         for scalemap in self.scalemap:
             for item, conv in scalemap.items():
-                unit = standardize_units(item)
-                if unit not in unique_units and unit is not None:
-                    unique_units.append(unit)
-                    conv_list.append(conv)
-            unique_units = [x for _, x in sorted(zip(conv_list, unique_units))]
-        return unique_units
-
-    def __call__(self, value: T, units: Optional[str] = "") -> Union[List[float], T]:
+                compatible.setdefault(_standardize_units_cached(item), conv)
+        # Sort once by conversion factor, using the unit itself to break ties
+        return [list(unit) for _, unit in sorted((conv, unit) for unit, conv in compatible.items())]
+
+    def __call__(self, value: T, units: Optional[str] = "", out: Optional[T] = None) -> Union[List[float], T]:
         # Note: calculating a*1 rather than simply returning a would produce
         # an unnecessary copy of the array, which in the case of the raw
         # counts array would be bad.  Sometimes copying and other times
         # not copying is also bad, but copy on modify semantics isn't
         # supported.
         if not units:
-            return value
-        return self.scale(units, value)
+            if out is None:
+                return value
+            out[...] = value
+            return out
+        return self.scale(units, value, out)
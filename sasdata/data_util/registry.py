@@ -4,15 +4,20 @@ File extension registry.
 This provides routines for opening files based on extension,
 and registers the built-in file extensions.
 """
+import gzip
+import mmap
 import os
-from urllib.request import urlopen
-from io import BytesIO
-from typing import Optional, List, Union, TYPE_CHECKING
-from collections import defaultdict
+import shutil
+from collections import OrderedDict
+from copy import deepcopy
+from tempfile import SpooledTemporaryFile
+from typing import Dict, Optional, List, Tuple, Union, TYPE_CHECKING
 from pathlib import Path
 
-from sasdata.data_util.loader_exceptions import NoKnownLoaderException
-from sasdata.data_util.util import unique_preserve_order
+import h5py
+
+from sasdata.data_util.loader_exceptions import FileContentsException, NoKnownLoaderException
+from sasdata.data_util.util import decode, unique_preserve_order
 from sasdata.dataloader import readers as all_readers
 
 # TYPE_CHECKING hides imports at runtime: https://docs.python.org/3/library/typing.html#typing.TYPE_CHECKING
@@ -24,6 +29,17 @@ DEPRECATION_MESSAGE = ("\rThe extension, {}, of the file, {}, suggests the data
                        " for the reader associated with this file type has been removed. An attempt to load the file "
                        "was made, but, should it be successful, SasView cannot guarantee the accuracy of the data.")
 
+# Remote files larger than this many bytes are spooled to a temporary file on disk rather than held in memory
+REMOTE_SPOOL_SIZE = 8 * 1024 * 1024
+# Buffer size used when copying a remote file into its spool
+REMOTE_CHUNK_SIZE = 256 * 1024
+# Number of bytes from the start of a file that reader signatures are checked against
+SIGNATURE_SIZE = 512
+# Format signature that starts the HDF5 superblock
+HDF5_SIGNATURE = b'\x89HDF\r\n\x1a\n'
+# Number of successfully loaded local files ExtensionRegistry.load() keeps for repeat loads of unchanged files
+LOAD_CACHE_SIZE = 32
+
 
 def create_empty_data_with_errors(path: Union[str, Path], errors: List[Exception]):
     """Create a Data1D instance that only holds errors and a filepath. This allows all file paths to return a common
@@ -35,31 +51,129 @@ def create_empty_data_with_errors(path: Union[str, Path], errors: List[Exception
     return [data_object]
 
 
+def is_hdf5(file_obj) -> bool:
+    """
+    Check for the HDF5 format signature without handing the file to libhdf5.
+
+    The superblock starts at byte 0, or after a user block at byte 512, 1024, 2048, ...
+
+    :param file_obj: Open binary file handle, returned to its starting position afterwards
+    :return: True if the file has an HDF5 signature
+    """
+    start = file_obj.tell()
+    try:
+        size = file_obj.seek(0, os.SEEK_END)
+        offset = 0
+        while offset + len(HDF5_SIGNATURE) <= size:
+            file_obj.seek(offset)
+            if file_obj.read(len(HDF5_SIGNATURE)) == HDF5_SIGNATURE:
+                return True
+            offset = max(512, 2 * offset)
+        return False
+    finally:
+        file_obj.seek(start)
+
+
+class RemoteFile(SpooledTemporaryFile):
+    """Local copy of a remote file. Small files are held in memory, larger ones roll over to a temporary file."""
+    def __init__(self, url: str):
+        super().__init__(max_size=REMOTE_SPOOL_SIZE, mode='w+b')
+        self.url = url
+
+    @property
+    def name(self) -> str:
+        """Readers use the name of the file handle to identify the data source, so report the URL."""
+        return self.url
+
+
 class CustomFileOpen:
     """Custom context manager to fetch file contents depending on where the file is located."""
     def __init__(self, filename, mode='rb'):
         self.filename = filename
         self.mode = mode
         self.fd = None
+        self._text = None
+        self._header = None
+        self._h5_fd = None
+        self._h5_checked = False
 
     def __enter__(self):
-        """A context method that either fetches a file from a URL or opens a local file."""
+        """
+        A context method that either fetches a file from a URL or opens a local file.
+        A handler that is already open, e.g. because the file was fetched ahead of time, is used as it is.
+        """
+        if self.fd is not None:
+            return self
         if '://' in self.filename:
-            # Use urllib.request package to access remote files
-            with urlopen(self.filename) as req:
-                content = req.read()
-                self.fd = BytesIO(content)
-                self.fd.name = self.filename
+            # Use urllib.request package to access remote files, streaming the body into a spooled local copy
+            # urllib.request pulls in http.client and email, so it is only imported once a remote file is opened
+            from urllib.request import Request, urlopen
+            # Allow the server to compress the transfer; the body is decompressed while it streams in
+            self.fd = RemoteFile(self.filename)
+            with urlopen(Request(self.filename, headers={'Accept-Encoding': 'gzip'})) as req:
+                if int(req.headers.get('Content-Length') or 0) > REMOTE_SPOOL_SIZE:
+                    # Too large to hold in memory, so write straight to disk rather than growing an in-memory buffer
+                    self.fd.rollover()
+                body = gzip.GzipFile(fileobj=req) if req.headers.get('Content-Encoding') == 'gzip' else req
+                shutil.copyfileobj(body, self.fd, REMOTE_CHUNK_SIZE)
+            self.fd.seek(0)
         else:
             # Use native open to access local files
             self.fd = open(self.filename, self.mode)
         # Return the instance to allow access to the filename, and any open file handles.
         return self
 
+    @property
+    def text(self) -> Optional[str]:
+        """
+        The entire file decoded as a string. The file is only read and decoded on first access, and the result is
+        shared by every reader that tries to load the file through this handler.
+        """
+        if self._text is None:
+            if 'b' in self.mode and not isinstance(self.fd, RemoteFile):
+                try:
+                    # Decode local files straight from a memory map, rather than reading a copy of them first
+                    with mmap.mmap(self.fd.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                            memoryview(mapped) as view:
+                        self._text = decode(view)
+                    return self._text
+                except (OSError, ValueError):
+                    # Empty files and file objects without a file descriptor cannot be mapped
+                    pass
+            self.fd.seek(0)
+            self._text = decode(self.fd.read())
+        return self._text
+
+    @property
+    def header(self) -> bytes:
+        """The first SIGNATURE_SIZE bytes of the file, read on first access and used to identify its format."""
+        if self._header is None:
+            self.fd.seek(0)
+            self._header = self.fd.read(SIGNATURE_SIZE)
+        return self._header
+
+    @property
+    def h5_fd(self) -> Optional[h5py.File]:
+        """
+        The file opened with h5py, or None if it is not an HDF5 file. The file is only checked and opened on first
+        access, and the open file is shared by every reader that tries to load the file through this handler.
+        """
+        if not self._h5_checked:
+            self._h5_checked = True
+            if is_hdf5(self.fd):
+                self._h5_fd = h5py.File(self.fd, 'r')
+        return self._h5_fd
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Close all open file handles when exiting the context manager."""
+        if self._h5_fd is not None:
+            self._h5_fd.close()
         if self.fd is not None:
             self.fd.close()
+        self._text = None
+        self._header = None
+        self._h5_fd = None
+        self._h5_checked = False
 
 
 class ExtensionRegistry:
@@ -113,61 +227,148 @@ class ExtensionRegistry:
             return cx3('hello.cx')
     """
     def __init__(self):
-        self.readers = defaultdict(list)
+        # Readers for each extension, highest priority first. Readers are registered at start up and rarely change
+        # afterwards, so they are kept in compact immutable tuples.
+        self.readers: Dict[str, Tuple[callable, ...]] = {}
+        # Sorted registered extensions and formats, and the largest number of dots in an extension. These are built on
+        # demand and reset by _clear_caches() whenever a new extension or format is registered.
+        self._extensions = None  # type: Optional[Tuple[str, ...]]
+        self._formats = None  # type: Optional[Tuple[str, ...]]
+        self._max_ext_dots = None  # type: Optional[int]
+        # Unique registered readers in priority order, keyed by the registered extensions matching a path
+        self._lookup_cache = {}  # type: Dict[Tuple[str, ...], List[callable]]
+        # The reader that last loaded a file, keyed by lower-case extension or format, so it is tried first next time
+        self._winner = {}  # type: Dict[str, callable]
+        # Generic readers tried after the readers for the extension, created on the first lookup and then reused
+        self._fallback_readers = None  # type: Optional[List[callable]]
+
+        # Data loaded from local files, keyed by _load_cache_key(), least recently used first
+        self._load_cache = OrderedDict()  # type: OrderedDict[tuple, List[Union["Data1D", "Data2D"]]]
 
         # Deprecated extensions
         self.deprecated_extensions = ['.asc']
 
     def __setitem__(self, ext: str, loader):
-        self.readers[ext].insert(0, loader)
+        self.readers[ext] = (loader,) + self.readers.get(ext, ())
+        self._clear_caches()
 
     def __getitem__(self, ext: str) -> List:
-        return self.readers[ext]
+        return list(self.readers.get(ext, ()))
 
     def __contains__(self, ext: str) -> bool:
         return ext in self.readers
 
+    def _clear_caches(self):
+        """
+        Forget everything derived from the registered readers.
+        Must be called whenever a reader is added to readers.
+        """
+        self._winner.clear()
+        self._lookup_cache.clear()
+        # A newly registered reader may be tried first, so earlier results no longer show what a load would return
+        self._load_cache.clear()
+        self._extensions = None
+        self._formats = None
+        self._max_ext_dots = None
+
     def formats(self) -> List[str]:
         """
         Return a sorted list of the registered formats.
         """
-        names = [a for a in self.readers.keys() if not a.startswith('.')]
-        names.sort()
-        return names
+        if self._formats is None:
+            self._formats = tuple(sorted(a for a in self.readers.keys() if not a.startswith('.')))
+        return list(self._formats)
 
     def extensions(self) -> List[str]:
         """
         Return a sorted list of registered extensions.
         """
-        exts = [a for a in self.readers.keys() if a.startswith('.')]
-        exts.sort()
-        return exts
+        if self._extensions is None:
+            self._extensions = tuple(sorted(a for a in self.readers.keys() if a.startswith('.')))
+        return list(self._extensions)
 
-    def lookup(self, path: str) -> List[callable]:
+    @staticmethod
+    def _file_name(path: Union[str, Path]) -> str:
+        """The final component of a file path or URL"""
+        path = os.fspath(path)
+        return path[max(path.rfind('/'), path.rfind(os.sep)) + 1:]
+
+    def _matching_extensions(self, name: str) -> Tuple[str, ...]:
+        """
+        Find the registered extensions a file name ends with by probing its suffixes, rather than testing every
+        registered extension.
+
+        :param name: File name, without any directories
+        :return: Matching extensions in increasing order of length, e.g. '.gz' then '.tar.gz'
+        """
+        if self._max_ext_dots is None:
+            self._max_ext_dots = max((ext.count('.') for ext in self.extensions()), default=0)
+        parts = name.rsplit('.', self._max_ext_dots)
+        extensions = ('.' + '.'.join(parts[-n:]) for n in range(1, len(parts)))
+        return tuple(ext for ext in extensions if ext in self.readers)
+
+    def lookup(self, path: Union[str, Path]) -> List[callable]:
         """
         Return the loader associated with the file type of path.
 
-        :param path: Data file path
+        :param path: Data file path or URL
         :return: List of available readers for the file extension (maybe empty)
         """
-        # Find matching lower-case extensions
-        path_lower = path.lower()
-        extensions = [ext for ext in self.extensions() if path_lower.endswith(ext)]
-        # Sort matching extensions by decreasing order of length
-        extensions.sort(key=len)
-        # Combine readers for matching extensions into one big list
-        readers = [reader for ext in extensions for reader in self.readers[ext]]
+        # Extensions are part of the file name, so only the final component of the path needs to be lower-cased
+        matched = self._matching_extensions(self._file_name(path).lower())
+        readers = self._lookup_cache.get(matched)
+        if readers is None:
+            # Combine readers for matching extensions into one big list
+            readers = [reader for ext in matched for reader in self.readers[ext]]
+            # Ensure the list of readers only includes unique values and the order is maintained
+            readers = self._lookup_cache[matched] = unique_preserve_order(readers)
         # include generic readers in list of available readers to ensure error handling works properly
-        readers.extend(all_readers.get_fallback_readers())
-        # Ensure the list of readers only includes unique values and the order is maintained
-        return unique_preserve_order(readers)
+        if self._fallback_readers is None:
+            self._fallback_readers = all_readers.get_fallback_readers()
+        return readers + self._fallback_readers
 
-    def load(self, path: str, ext: Optional[str] = None) -> List[Union["Data1D", "Data2D"]]:
+    def clear_cache(self):
+        """
+        Forget all previously loaded data so the next load of any file reads it from disk.
+        """
+        self._load_cache.clear()
+
+    @staticmethod
+    def _load_cache_key(path: Union[str, Path], ext: Optional[str]) -> Optional[tuple]:
+        """
+        Build the key identifying a load of an unchanged local file.
+
+        :param path: Data file path
+        :param ext: Explicit format passed to load()
+        :return: Key for the load cache, or None if the result should not be cached
+        """
+        path = os.fspath(path)
+        if '://' in path:
+            # Remote files have no cheap way to tell if they changed
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return os.path.abspath(path), ext, stat.st_mtime_ns, stat.st_size
+
+    def load(self, path: str, ext: Optional[str] = None,
+             file_handler: Optional[CustomFileOpen] = None) -> List[Union["Data1D", "Data2D"]]:
         """
         Call the loader for a single file.
 
+        :param path: Data file path or URL
+        :param ext: Explicit extension or format, to force the use of the readers registered for it
+        :param file_handler: Handler already open for path, such as a remote file fetched ahead of time. It is closed
+            once the file is read, but the caller must close it if loading stops before then.
+
         Exceptions are stored in Data1D instances, with the errors in Data1D.errors
+        Data loaded from local files is cached, and a copy returned if the same, unchanged file is loaded again.
         """
+        cache_key = self._load_cache_key(path, ext)
+        if cache_key in self._load_cache:
+            self._load_cache.move_to_end(cache_key)
+            return deepcopy(self._load_cache[cache_key])
         if ext is None:
             loaders = self.lookup(path)
             _, ext = os.path.splitext(path)
@@ -175,18 +376,38 @@ class ExtensionRegistry:
                 raise NoKnownLoaderException("No loaders match extension in %r"
                                              % path)
         else:
-            loaders = self.readers.get(ext.lower(), [])
+            loaders = list(self.readers.get(ext.lower(), ()))
             if not loaders:
                 raise NoKnownLoaderException("No loaders match format %r"
                                              % ext)
+        # Try the reader that succeeded for the last file of this type first, keeping the others in priority order
+        winner = self._winner.get(ext.lower())
+        if winner is not None and winner in loaders:
+            loaders = [winner] + [loader for loader in loaders if loader != winner]
         errors = []
-        with CustomFileOpen(path, 'rb') as file_handler:
+        if file_handler is None:
+            file_handler = CustomFileOpen(path, 'rb')
+        with file_handler:
             for load_function in loaders:
+                # Skip readers that can tell the file is not in their format, rather than letting them raise
+                reader = getattr(load_function, '__self__', None)
+                if hasattr(reader, 'accepts') and not reader.accepts(file_handler):
+                    errors.append(FileContentsException(f"{path} is not a {reader.type_name} file."))
+                    continue
                 try:
                     loaded_data = load_function(path, file_handler)
                     # Check if the file read support is deprecated
                     if ext.lower() in self.deprecated_extensions:
                         loaded_data[0].errors.append(DEPRECATION_MESSAGE.format(ext, path))
+                    # The generic fallback readers accept loosely formatted files, so they are never promoted ahead
+                    # of the readers registered for the file type
+                    if load_function not in (self._fallback_readers or ()):
+                        self._winner[ext.lower()] = load_function
+                    if cache_key is not None:
+                        # Keep a private copy so changes the caller makes to the data are not cached
+                        self._load_cache[cache_key] = deepcopy(loaded_data)
+                        if len(self._load_cache) > LOAD_CACHE_SIZE:
+                            self._load_cache.popitem(last=False)
                     return loaded_data
                 except Exception as e:
                     errors.append(e)
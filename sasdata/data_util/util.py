@@ -1,10 +1,32 @@
-from typing import List, Any
+import codecs
+import logging
+from typing import Iterable, List, Any, Optional, Union
 
+logger = logging.getLogger(__name__)
 
-def unique_preserve_order(seq: List[Any]) -> List[Any]:
+
+def unique_preserve_order(seq: Iterable[Any]) -> List[Any]:
     """ Remove duplicates from list preserving order
-    Fastest according to benchmarks at https://www.peterbe.com/plog/uniqifiers-benchmark
+    dicts keep insertion order, so their keys are the unique items in the order first seen, hashing each item once
     """
-    seen = set()
-    seen_add = seen.add
-    return [x for x in seq if not (x in seen or seen_add(x))]
+    return list(dict.fromkeys(seq))
+
+
+def decode(s: Union[bytes, bytearray, memoryview, str]) -> Optional[str]:
+    if not isinstance(s, (bytes, bytearray, memoryview)):
+        return s
+    # Most data files and HDF5 strings are plain ASCII, which needs no codec fallbacks
+    if isinstance(s, bytes) and s.isascii():
+        return s.decode('ascii')
+    # Attempt to decode files using common encodings
+    # *NB* windows-1252, aka cp1252, overlaps with most ASCII-style encodings
+    for codec in ('utf-8', 'windows-1252'):
+        try:
+            return codecs.decode(s, codec)
+        except (ValueError, UnicodeError):
+            # If the specific codec fails, try the next one.
+            pass
+        except Exception as e:
+            logger.warning(e)
+    # Give warning if unable to decode the item using the codecs
+    logger.warning(f"Unable to decode {s}")
@@ -4,12 +4,16 @@ All generic functionality required for a file loader/reader is built into this
 class
 """
 
+import os
 import pathlib
-import codecs
 import logging
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Union, Optional
+from io import StringIO
+from typing import Iterator, List, Union, Optional, Pattern
 
 import numpy as np
 from sasdata.data_util.loader_exceptions import NoKnownLoaderException, FileContentsException,\
@@ -18,29 +22,44 @@ from sasdata.dataloader.data_info import Data1D, Data2D, DataInfo, plottable_1D,
     combine_data_info_with_plottable
 from sasdata.data_util.nxsunit import Converter
 from sasdata.data_util.registry import CustomFileOpen
+from sasdata.data_util.util import decode
 
 logger = logging.getLogger(__name__)
 
 
-def decode(s):
-    # Attempt to decode files using common encodings
-    # *NB* windows-1252, aka cp1252, overlaps with most ASCII-style encodings
-    for codec in ['utf-8', 'windows-1252']:
-        try:
-            return codecs.decode(s, codec) if isinstance(s, bytes) else s
-        except (ValueError, UnicodeError):
-            # If the specific codec fails, try the next one.
-            pass
-        except Exception as e:
-            logger.warning(e)
-    # Give warning if unable to decode the item using the codecs
-    logger.warning(f"Unable to decode {s}")
-
-
 # Data 1D fields for iterative purposes
 FIELDS_1D = 'x', 'y', 'dx', 'dy', 'dxl', 'dxw'
 # Data 2D fields for iterative purposes
 FIELDS_2D = 'data', 'qx_data', 'qy_data', 'q_data', 'err_data', 'dqx_data', 'dqy_data', 'mask'
+# (name, getter) pairs for the fields, so hot loops fetch them without a getattr lookup by string
+GETTERS_1D = tuple((name, attrgetter(name)) for name in FIELDS_1D)
+GETTERS_2D = tuple((name, attrgetter(name)) for name in FIELDS_2D)
+# Data 1D fields reordered when sorting, which also include the wavelength fields
+SORT_GETTERS_1D = GETTERS_1D + tuple((name, attrgetter(name)) for name in ('lam', 'dlam'))
+# Most threads used to convert the units of files with many data sets
+MAX_CONVERSION_THREADS = 8
+
+
+@lru_cache(maxsize=128)
+def _get_converter(units: str) -> Converter:
+    """
+    Converter for data in the given units, shared by every data set in those units.
+    Converters for units that are not recognized raise KeyError and are not cached.
+    """
+    return Converter(units)
+
+
+@lru_cache(maxsize=128)
+def _format_unit(unit: Optional[str]) -> Optional[str]:
+    """Unit string with any divisor written as a negative power, e.g. 1/A -> A^{-1}"""
+    if unit:
+        split = unit.split("/")
+        if len(split) == 1:
+            return unit
+        elif split[0] == '1':
+            return f"{split[1]}^{{-1}}"
+        else:
+            return f"{split[0]}*{split[1]}^{{-1}}"
 
 
 class FileReader:
@@ -56,6 +75,9 @@ class FileReader:
     # Bypass extension check and try to load anyway
     allow_all = False
 
+    # Pattern the first bytes of a supported file must match, or None if the format has no fixed signature
+    signature = None  # type: Optional[Pattern[bytes]]
+
     # Able to import the unit converter
     has_converter = True
 
@@ -74,6 +96,10 @@ class FileReader:
         self.extension = None
         # Open file handle
         self.f_open = None
+        # CustomFileOpen instance wrapping the open file handle
+        self.file_handler = None
+        # Lines of the decoded file, created when nextline() or nextlines() is first called
+        self._line_buffer = None
 
     def read(self, filepath: Union[str, Path], file_handler: Optional[CustomFileOpen] = None,
              f_pos: Optional[int] = 0) -> List[Union[Data1D, Data2D]]:
@@ -94,6 +120,15 @@ class FileReader:
                 return self._read(file_handler)
         return self._read(file_handler)
 
+    def accepts(self, file_handler: CustomFileOpen) -> bool:
+        """
+        Cheaply check if the file could be in a format this reader loads. Used to skip the reader without running it.
+
+        :param file_handler: A CustomFileOpen instance used to handle file operations
+        :return: False if the file is definitely not in a supported format
+        """
+        return self.signature is None or self.signature.match(file_handler.header) is not None
+
     def _read(self, file_handler: CustomFileOpen) -> List[Union[Data1D, Data2D]]:
         """
         Private method to handle file loading
@@ -102,12 +137,13 @@ class FileReader:
         :param f_pos: The initial file position to start the read from
         :return: A list of Data1D and Data2D objects
         """
+        self.file_handler = file_handler
         self.f_open = file_handler.fd
         # Move to the desired initial file position in case of successive reads on the same handle
         self.f_open.seek(self.f_pos)
+        self._line_buffer = None
 
-        basename, extension = self.filepath.stem, self.filepath.suffix
-        self.extension = extension.lower()
+        self.extension = os.path.splitext(self.filepath.name)[1].lower()
         if self.extension in self.ext or self.allow_all:
             try:
                 # All raised exceptions are handled by ExtensionRegistry.load(). No exception handling here.
@@ -140,23 +176,34 @@ class FileReader:
         self.ind = None
         self.output = []
 
+    def _lines(self) -> StringIO:
+        """
+        The remaining lines of the file. The file is decoded in one go when the first line is requested, rather than
+        one line at a time.
+        """
+        if self._line_buffer is None:
+            self._line_buffer = StringIO(self.readall() or '')
+        return self._line_buffer
+
     def nextline(self) -> str:
         """
         Returns the next line in the file as a string.
         """
-        return decode(self.f_open.readline())
+        return self._lines().readline()
 
-    def nextlines(self) -> str:
+    def nextlines(self) -> Iterator[str]:
         """
         Returns the next line in the file as a string.
         """
-        for line in self.f_open:
-            yield decode(line)
+        yield from self._lines()
 
     def readall(self) -> str:
         """
         Returns the entire file as a string.
         """
+        if self.f_pos == 0:
+            # Share the decoded contents with any other reader trying the same file handle
+            return self.file_handler.text
         self.f_open.seek(self.f_pos)
         return decode(self.f_open.read())
 
@@ -194,32 +241,31 @@ class FileReader:
                 data._xunit = data.x_unit
                 data.y_unit = self.format_unit(data.y_unit)
                 data._yunit = data.y_unit
-                # Sort data by increasing x and remove 1st point
-                ind = np.lexsort((data.y, data.x))
-                data.x = self._reorder_1d_array(data.x, ind)
-                data.y = self._reorder_1d_array(data.y, ind)
-                if data.dx is not None:
-                    if len(data.dx) == 0:
-                        data.dx = None
-                        continue
-                    data.dx = self._reorder_1d_array(data.dx, ind)
-                if data.dxl is not None:
-                    data.dxl = self._reorder_1d_array(data.dxl, ind)
-                if data.dxw is not None:
-                    data.dxw = self._reorder_1d_array(data.dxw, ind)
-                if data.dy is not None:
-                    if len(data.dy) == 0:
-                        data.dy = None
-                        continue
-                    data.dy = self._reorder_1d_array(data.dy, ind)
-                if data.lam is not None:
-                    data.lam = self._reorder_1d_array(data.lam, ind)
-                if data.dlam is not None:
-                    data.dlam = self._reorder_1d_array(data.dlam, ind)
-                data = self._remove_nans_in_data(data)
+                # Empty resolutions are treated as missing
+                if data.dx is not None and len(data.dx) == 0:
+                    data.dx = None
+                if data.dy is not None and len(data.dy) == 0:
+                    data.dy = None
+                arrays = {}
+                for name, getter in SORT_GETTERS_1D:
+                    array = getter(data)
+                    if array is not None:
+                        arrays[name] = np.asarray(array, dtype=np.float64)
+                # Sort data by increasing x and drop points with non-finite values, reordering each array only once
+                ind = self._sort_1d_indices(arrays['x'], arrays['y'])
+                good = np.isfinite(arrays['x'])
+                for name in FIELDS_1D[1:]:
+                    if name in arrays:
+                        good &= np.isfinite(arrays[name])
+                if not np.all(good):
+                    ind = np.flatnonzero(good) if ind is None else ind[good[ind]]
+                # The arrays were cast to float64 above, so reordering them only needs an index; unsorted data is
+                # still copied so the data set never shares arrays with the reader
+                for name, array in arrays.items():
+                    setattr(data, name, array.copy() if ind is None else array[ind])
                 if len(data.x) > 0:
-                    data.xmin = np.min(data.x)
-                    data.xmax = np.max(data.x)
+                    data.xmin = data.x[0]
+                    data.xmax = data.x[-1]
                     data.ymin = np.min(data.y)
                     data.ymax = np.max(data.y)
             elif isinstance(data, Data2D):
@@ -229,23 +275,18 @@ class FileReader:
                 data._xunit = data.Q_unit
                 data._yunit = data.Q_unit
                 data._zunit = data.I_unit
-                data.data = data.data.astype(np.float64)
-                data.qx_data = data.qx_data.astype(np.float64)
-                data.xmin = np.min(data.qx_data)
-                data.xmax = np.max(data.qx_data)
-                data.qy_data = data.qy_data.astype(np.float64)
-                data.ymin = np.min(data.qy_data)
-                data.ymax = np.max(data.qy_data)
-                data.q_data = np.sqrt(data.qx_data * data.qx_data
-                                         + data.qy_data * data.qy_data)
+                data.data = data.data.astype(np.float64, copy=False)
+                data.qx_data = data.qx_data.astype(np.float64, copy=False)
+                data.qy_data = data.qy_data.astype(np.float64, copy=False)
+                data.q_data = np.hypot(data.qx_data, data.qy_data)
                 if data.err_data is not None:
-                    data.err_data = data.err_data.astype(np.float64)
+                    data.err_data = data.err_data.astype(np.float64, copy=False)
                 if data.dqx_data is not None:
-                    data.dqx_data = data.dqx_data.astype(np.float64)
+                    data.dqx_data = data.dqx_data.astype(np.float64, copy=False)
                 if data.dqy_data is not None:
-                    data.dqy_data = data.dqy_data.astype(np.float64)
+                    data.dqy_data = data.dqy_data.astype(np.float64, copy=False)
                 if data.mask is not None:
-                    data.mask = data.mask.astype(dtype=bool)
+                    data.mask = data.mask.astype(dtype=bool, copy=False)
                     # If all mask elements are False, give a warning to the user
                     if not data.mask.any():
                         error = "The entire dataset is masked and may not "
@@ -258,6 +299,7 @@ class FileReader:
                     data.x_bins = data.qx_data[:int(n_cols)]
                     data.data = data.data.flatten()
                 data = self._remove_nans_in_data(data)
+                # The Q range is only found once the points that will be dropped are gone
                 if len(data.data) > 0:
                     data.xmin = np.min(data.qx_data)
                     data.xmax = np.max(data.qx_data)
@@ -265,15 +307,26 @@ class FileReader:
                     data.ymax = np.max(data.qy_data)
 
     @staticmethod
-    def _reorder_1d_array(array: np.array, ind: int) -> np.array:
-        """
-        Reorders a 1D array based on the indices passed as ind
-        :param array: Array to be reordered
-        :param ind: Indices used to reorder array
-        :return: reordered array
-        """
-        array = np.asarray(array, dtype=np.float64)
-        return array[ind]
+    def _sort_1d_indices(x: np.array, y: np.array) -> Optional[np.array]:
+        """
+        Find the order of 1D data points by increasing x, and then by increasing y for points with the same x
+        :param x: x values of the data points
+        :param y: y values of the data points
+        :return: Indices that sort the points, or None if they are already in order
+        """
+        x = np.asarray(x, dtype=np.float64)
+        # Most files are written in order of increasing Q, which one pass confirms without sorting. Equal x values
+        # still need sorting by y, and any NaN fails the comparison too.
+        if np.all(x[1:] > x[:-1]):
+            return None
+        ind = np.argsort(x, kind='stable')
+        x_sorted = x[ind]
+        if np.any(x_sorted[1:] == x_sorted[:-1]):
+            # Sorting on x alone would leave points with the same x in file order
+            ind = np.lexsort((y, x))
+        elif np.all(ind[1:] > ind[:-1]):
+            return None
+        return ind
 
     @staticmethod
     def _remove_nans_in_data(data: Union[Data1D, Data2D]) -> Union[Data1D, Data2D]:
@@ -283,23 +336,29 @@ class FileReader:
         :return: data with nan points removed
         """
         if isinstance(data, Data1D):
-            fields = FIELDS_1D
+            getters = GETTERS_1D
         elif isinstance(data, Data2D):
-            fields = FIELDS_2D
+            getters = GETTERS_2D
         else:
             return data
+        # Fetch each field once, for both finding and removing the bad points
+        present = [(name, getter(data)) for name, getter in getters]
+        present = [(name, array) for name, array in present if array is not None]
         # Make array of good points - all others will be removed
-        good = np.isfinite(getattr(data, fields[0]))
-        for name in fields[1:]:
-            array = getattr(data, name)
-            if array is not None:
-                # Update good points only if not already changed
+        good = np.isfinite(present[0][1])
+        # Reused for the finite points of each field, rather than allocating a new array per field
+        finite = np.empty_like(good)
+        for _, array in present[1:]:
+            # Integer and boolean values, like the mask, are always finite
+            if np.asarray(array).dtype.kind in 'biu':
+                continue
+            if np.shape(array) == good.shape:
+                good &= np.isfinite(array, out=finite)
+            else:
                 good &= np.isfinite(array)
         if not np.all(good):
-            for name in fields:
-                array = getattr(data, name)
-                if array is not None:
-                    setattr(data, name, array[good])
+            for name, array in present:
+                setattr(data, name, array[good])
         return data
 
     @staticmethod
@@ -331,58 +390,80 @@ class FileReader:
         cm^{-1} for I.
         :param default_q_unit: The default Q unit used by Sasview
         """
-        convert_q = True
-        new_output = []
-        for data in self.output:
-            if data.isSesans:
-                new_output.append(data)
-                continue
-            try:
-                file_x_unit = data._xunit
-                data_conv_x = Converter(file_x_unit)
-            except KeyError:
-                logger.info("Unrecognized Q units in data file. No data conversion attempted")
-                convert_q = False
-            try:
+        # Arrays converted in place, so an array shared between data sets is only converted once
+        converted = {}
+        if len(self.output) > 2:
+            # NumPy releases the GIL while scaling arrays, so the data sets of files with many frames are converted
+            # in parallel
+            with ThreadPoolExecutor(max_workers=min(MAX_CONVERSION_THREADS, len(self.output))) as executor:
+                list(executor.map(lambda data: self._convert_data_set_units(data, default_q_unit, converted),
+                                  self.output))
+        else:
+            for data in self.output:
+                self._convert_data_set_units(data, default_q_unit, converted)
+
+    def _convert_data_set_units(self, data: Union[Data1D, Data2D], default_q_unit: str, converted: dict):
+        """
+        Converts the Q values and resolutions of a single data set to the default Q units
+        :param data: Data set to convert
+        :param default_q_unit: The default Q unit used by Sasview
+        :param converted: Arrays already converted in place, by id
+        """
+        if data.isSesans:
+            return
+        try:
+            file_x_unit = data._xunit
+            data_conv_x = _get_converter(file_x_unit)
+        except KeyError:
+            logger.info("Unrecognized Q units in data file. No data conversion attempted")
+            return
+        try:
+            if isinstance(data, Data1D):
+                data.x = self._convert_array(data_conv_x, data.x, default_q_unit, converted)
+                data._xunit = default_q_unit
+                data.x_unit = default_q_unit
+                if data.dx is not None:
+                    data.dx = self._convert_array(data_conv_x, data.dx, default_q_unit, converted)
+                if data.dxl is not None:
+                    data.dxl = self._convert_array(data_conv_x, data.dxl, default_q_unit, converted)
+                if data.dxw is not None:
+                    data.dxw = self._convert_array(data_conv_x, data.dxw, default_q_unit, converted)
+            elif isinstance(data, Data2D):
+                data.qx_data = self._convert_array(data_conv_x, data.qx_data, default_q_unit, converted)
+                if data.dqx_data is not None:
+                    data.dqx_data = self._convert_array(data_conv_x, data.dqx_data, default_q_unit, converted)
+                try:
+                    file_y_unit = data._yunit
+                    data_conv_y = _get_converter(file_y_unit)
+                    data.qy_data = self._convert_array(data_conv_y, data.qy_data, default_q_unit, converted)
+                    if data.dqy_data is not None:
+                        data.dqy_data = self._convert_array(data_conv_y, data.dqy_data, default_q_unit, converted)
+                except KeyError:
+                    logger.info("Unrecognized Qy units in data file. No"
+                                " data conversion attempted")
+        except KeyError:
+            message = "Unable to convert Q units from {0} to 1/A."
+            message.format(default_q_unit)
+            data.errors.append(message)
 
-                if isinstance(data, Data1D):
-                    if convert_q:
-                        data.x = data_conv_x(data.x, units=default_q_unit)
-                        data._xunit = default_q_unit
-                        data.x_unit = default_q_unit
-                        if data.dx is not None:
-                            data.dx = data_conv_x(data.dx,
-                                                  units=default_q_unit)
-                        if data.dxl is not None:
-                            data.dxl = data_conv_x(data.dxl,
-                                                   units=default_q_unit)
-                        if data.dxw is not None:
-                            data.dxw = data_conv_x(data.dxw,
-                                                   units=default_q_unit)
-                elif isinstance(data, Data2D):
-                    if convert_q:
-                        data.qx_data = data_conv_x(data.qx_data,
-                                                   units=default_q_unit)
-                        if data.dqx_data is not None:
-                            data.dqx_data = data_conv_x(data.dqx_data,
-                                                        units=default_q_unit)
-                        try:
-                            file_y_unit = data._yunit
-                            data_conv_y = Converter(file_y_unit)
-                            data.qy_data = data_conv_y(data.qy_data,
-                                                       units=default_q_unit)
-                            if data.dqy_data is not None:
-                                data.dqy_data = data_conv_y(data.dqy_data,
-                                                            units=default_q_unit)
-                        except KeyError:
-                            logger.info("Unrecognized Qy units in data file. No"
-                                        " data conversion attempted")
-            except KeyError:
-                message = "Unable to convert Q units from {0} to 1/A."
-                message.format(default_q_unit)
-                data.errors.append(message)
-            new_output.append(data)
-        self.output = new_output
+    @staticmethod
+    def _convert_array(converter: Converter, array, units: str, converted: dict):
+        """
+        Convert an array of values to new units. Float arrays that own their memory are converted in place rather
+        than copied.
+        :param converter: Converter for the current units of the array
+        :param array: Values to convert
+        :param units: Units to convert to
+        :param converted: Arrays already converted in place, by id, which are returned unchanged
+        :return: Converted values
+        """
+        if isinstance(array, np.ndarray) and array.dtype.kind == 'f' and array.base is None and array.flags.writeable:
+            # Claim the array with a single dict operation, so only one thread converts a shared array
+            claim = object()
+            if converted.setdefault(id(array), claim) is claim:
+                converter(array, units=units, out=array)
+            return array
+        return converter(array, units=units)
 
     def format_unit(self, unit: str = None) -> str:
         """
@@ -390,14 +471,7 @@ class FileReader:
         :param unit:
         :return:
         """
-        if unit:
-            split = unit.split("/")
-            if len(split) == 1:
-                return unit
-            elif split[0] == '1':
-                return f"{split[1]}^{{-1}}"
-            else:
-                return f"{split[0]}*{split[1]}^{{-1}}"
+        return _format_unit(unit)
 
     def set_all_to_none(self):
         """
@@ -428,71 +502,59 @@ class FileReader:
             has_error_dy = self.current_dataset.dy is not None
             # Create arrays of zeros for non-existent resolutions
             if has_error_dxw and not has_error_dxl:
-                array_size = self.current_dataset.dxw.size - 1
-                self.current_dataset.dxl = np.append(self.current_dataset.dxl,
-                                                    np.zeros([array_size]))
+                self.current_dataset.dxl = np.zeros(self.current_dataset.dxw.size)
                 has_error_dxl = True
             elif has_error_dxl and not has_error_dxw:
-                array_size = self.current_dataset.dxl.size - 1
-                self.current_dataset.dxw = np.append(self.current_dataset.dxw,
-                                                    np.zeros([array_size]))
+                self.current_dataset.dxw = np.zeros(self.current_dataset.dxl.size)
                 has_error_dxw = True
             elif not has_error_dxl and not has_error_dxw and not has_error_dx:
-                array_size = self.current_dataset.x.size - 1
-                self.current_dataset.dx = np.append(self.current_dataset.dx,
-                                                    np.zeros([array_size]))
+                self.current_dataset.dx = np.zeros(self.current_dataset.x.size)
                 has_error_dx = True
             if not has_error_dy:
-                array_size = self.current_dataset.y.size - 1
-                self.current_dataset.dy = np.append(self.current_dataset.dy,
-                                                    np.zeros([array_size]))
+                self.current_dataset.dy = np.zeros(self.current_dataset.y.size)
                 has_error_dy = True
 
             # Remove points where q = 0
-            x = self.current_dataset.x
-            self.current_dataset.x = self.current_dataset.x[x != 0]
-            self.current_dataset.y = self.current_dataset.y[x != 0]
+            nonzero = self.current_dataset.x != 0
+            if np.all(nonzero):
+                return
+            self.current_dataset.x = self.current_dataset.x[nonzero]
+            self.current_dataset.y = self.current_dataset.y[nonzero]
             if has_error_dy:
-                self.current_dataset.dy = self.current_dataset.dy[x != 0]
+                self.current_dataset.dy = self.current_dataset.dy[nonzero]
             if has_error_dx:
-                self.current_dataset.dx = self.current_dataset.dx[x != 0]
+                self.current_dataset.dx = self.current_dataset.dx[nonzero]
             if has_error_dxl:
-                self.current_dataset.dxl = self.current_dataset.dxl[x != 0]
+                self.current_dataset.dxl = self.current_dataset.dxl[nonzero]
             if has_error_dxw:
-                self.current_dataset.dxw = self.current_dataset.dxw[x != 0]
+                self.current_dataset.dxw = self.current_dataset.dxw[nonzero]
         elif isinstance(self.current_dataset, plottable_2D):
             has_error_dqx = self.current_dataset.dqx_data is not None
             has_error_dqy = self.current_dataset.dqy_data is not None
             has_error_dy = self.current_dataset.err_data is not None
             has_mask = self.current_dataset.mask is not None
-            x = self.current_dataset.qx_data
-            self.current_dataset.data = self.current_dataset.data[x != 0]
-            self.current_dataset.qx_data = self.current_dataset.qx_data[x != 0]
-            self.current_dataset.qy_data = self.current_dataset.qy_data[x != 0]
-            self.current_dataset.q_data = np.sqrt(
-                np.square(self.current_dataset.qx_data) + np.square(
-                    self.current_dataset.qy_data))
-            if has_error_dy:
-                self.current_dataset.err_data = self.current_dataset.err_data[
-                    x != 0]
-            if has_error_dqx:
-                self.current_dataset.dqx_data = self.current_dataset.dqx_data[
-                    x != 0]
-            if has_error_dqy:
-                self.current_dataset.dqy_data = self.current_dataset.dqy_data[
-                    x != 0]
-            if has_mask:
-                self.current_dataset.mask = self.current_dataset.mask[x != 0]
+            nonzero = self.current_dataset.qx_data != 0
+            # Indexing also flattens data still in its 2D shape
+            if not np.all(nonzero) or nonzero.ndim > 1:
+                self.current_dataset.data = self.current_dataset.data[nonzero]
+                self.current_dataset.qx_data = self.current_dataset.qx_data[nonzero]
+                self.current_dataset.qy_data = self.current_dataset.qy_data[nonzero]
+                if has_error_dy:
+                    self.current_dataset.err_data = self.current_dataset.err_data[nonzero]
+                if has_error_dqx:
+                    self.current_dataset.dqx_data = self.current_dataset.dqx_data[nonzero]
+                if has_error_dqy:
+                    self.current_dataset.dqy_data = self.current_dataset.dqy_data[nonzero]
+                if has_mask:
+                    self.current_dataset.mask = self.current_dataset.mask[nonzero]
+            self.current_dataset.q_data = np.hypot(self.current_dataset.qx_data, self.current_dataset.qy_data)
 
     def reset_data_list(self, no_lines: int = 0):
         """
         Reset the plottable_1D object
         """
-        # Initialize data sets with arrays the maximum possible size
-        x = np.zeros(no_lines)
-        y = np.zeros(no_lines)
-        dx = np.zeros(no_lines)
-        dy = np.zeros(no_lines)
+        # Initialize data sets with arrays the maximum possible size, as rows of a single allocation
+        x, y, dx, dy = np.zeros((4, no_lines))
         self.current_dataset = plottable_1D(x, y, dx, dy)
 
     @staticmethod
@@ -502,15 +564,35 @@ class FileReader:
         :param line: A single line of text
         :return: list of values
         """
-        # Initial try for CSV (split on ,)
-        toks = line.split(',')
-        # Now try SCSV (split on ;)
-        if len(toks) < 2:
-            toks = line.split(';')
-        # Now go for whitespace
-        if len(toks) < 2:
-            toks = line.split()
-        return toks
+        return line.split(FileReader.delimiter(line))
+
+    @staticmethod
+    def delimiter(line: str) -> Optional[str]:
+        """
+        Find the delimiter splitline uses for a line of text
+        :param line: A single line of text
+        :return: ',' for CSV, ';' for SCSV, or None for whitespace
+        """
+        # Initial try for CSV (split on ,), then SCSV (split on ;), then go for whitespace
+        if ',' in line:
+            return ','
+        if ';' in line:
+            return ';'
+        return None
+
+    @staticmethod
+    def parse_columns(lines: List[str], delimiter: Optional[str] = None) -> np.ndarray:
+        """
+        Parse lines of delimited numbers into an array in a single pass, rather than splitting and converting
+        each line in Python. Blank lines are skipped.
+        :param lines: Lines of text, each with the same number of values
+        :param delimiter: Delimiter between values, as returned by delimiter(); None splits on whitespace
+        :return: 2D float array with one row per non-blank line
+        :raises ValueError: If a value is not numeric or the number of values changes between lines
+        """
+        if not any(map(str.strip, lines)):
+            return np.empty((0, 0))
+        return np.loadtxt(lines, dtype=np.float64, delimiter=delimiter, comments=None, ndmin=2)
 
     @abstractmethod
     def get_file_contents(self):
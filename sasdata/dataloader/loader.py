@@ -17,18 +17,20 @@
 # copyright 2008, University of Tennessee
 ######################################################################
 
+import importlib
 import os
 import sys
 import logging
 import time
 from zipfile import ZipFile
+from concurrent.futures import Future, ThreadPoolExecutor
 from collections import defaultdict
 from types import ModuleType
-from typing import Optional, Union, List
+from typing import Dict, Optional, Tuple, Union, List
 from itertools import zip_longest
 from pathlib import Path
 
-from sasdata.data_util.registry import ExtensionRegistry
+from sasdata.data_util.registry import CustomFileOpen, ExtensionRegistry
 from sasdata.data_util.util import unique_preserve_order
 from sasdata.dataloader.data_info import Data1D, Data2D
 
@@ -37,6 +39,9 @@ from . import readers
 
 logger = logging.getLogger(__name__)
 
+# Most remote files downloaded at the same time when loading a list of files
+MAX_DOWNLOAD_THREADS = 8
+
 
 class Registry(ExtensionRegistry):
     """
@@ -49,9 +54,11 @@ class Registry(ExtensionRegistry):
 
         # Writers
         self.writers = defaultdict(list)
+        # The writer that last saved a file, keyed by the writers tried for it, so it is tried first next time
+        self._writer_winner = {}  # type: Dict[Tuple[callable, ...], callable]
 
-        # List of wildcards
-        self.wildcards = ['All (*.*)|*.*']
+        # Wildcards in the order they were registered, as dictionary keys so duplicates are dropped in constant time
+        self._wildcards = {'All (*.*)|*.*': None}  # type: Dict[str, None]
 
         # Creation time, for testing
         self._created = time.time()
@@ -89,11 +96,64 @@ class Registry(ExtensionRegistry):
             raise IndexError(f"The file extensions, {ext}, and file paths, {file_path_list} are not the same length. ")
         output = []
         # Use zip_longest for times where no ext or a single ext is passed
-        # Note: load() returns a list, so list comprehension would create a list of lists, without multiple loops
-        for file_path, ext_n in zip_longest(file_path_list, ext, fillvalue=ext[0]):
-            output.extend(self.as_super.load(file_path, ext=ext_n))
+        file_paths_and_exts = list(zip_longest(file_path_list, ext, fillvalue=ext[0]))
+        handlers = self._fetch_remote_files([file_path for file_path, _ in file_paths_and_exts])
+        try:
+            # Note: load() returns a list, so list comprehension would create a list of lists, without multiple loops
+            for (file_path, ext_n), handler in zip(file_paths_and_exts, handlers):
+                output.extend(self.as_super.load(file_path, ext=ext_n,
+                                                 file_handler=handler.result() if handler else None))
+        finally:
+            self._close_fetched_files(handlers)
         return output
 
+    @staticmethod
+    def _fetch_remote_files(file_paths: List[Union[str, Path]]) -> List[Optional[Future]]:
+        """
+        Start downloading the remote files in a list in parallel, as the transfers are bound by the network rather than
+        the CPU. The readers keep state while they read, so the files themselves are still read one at a time.
+        :param file_paths: File paths and URLs to load
+        :return: For each path, a future for its open file handler if the path is a URL being fetched, else None
+        """
+        handlers = [None] * len(file_paths)
+        remote = [i for i, file_path in enumerate(file_paths) if '://' in os.fspath(file_path)]
+        if len(remote) < 2:
+            # A single file is fetched when it is loaded
+            return handlers
+        executor = ThreadPoolExecutor(max_workers=min(MAX_DOWNLOAD_THREADS, len(remote)))
+        for i in remote:
+            handlers[i] = executor.submit(CustomFileOpen(os.fspath(file_paths[i]), 'rb').__enter__)
+        # Let loading start on the first files while the rest are still downloading
+        executor.shutdown(wait=False)
+        return handlers
+
+    @staticmethod
+    def _close_fetched_files(handlers: List[Optional[Future]]):
+        """
+        Close every fetched file, including any not loaded because loading stopped early
+        :param handlers: Futures returned by _fetch_remote_files()
+        """
+        for handler in handlers:
+            if handler is not None and not handler.cancel() and handler.exception() is None:
+                handler.result().__exit__(None, None, None)
+
+    @staticmethod
+    def _resolve_plugin_dir(dir: str) -> Optional[str]:
+        """
+        Find a plugin directory given as an absolute path, or as a path relative to the working directory, this
+        module or the parent of the directory of the running script.
+        :param dir: directory to search for
+        :return: the path to the directory, or None if it does not exist
+        """
+        # os.path.abspath already covers paths relative to the working directory
+        candidates = [os.path.abspath(dir),
+                      os.path.join(os.path.dirname(__file__), dir),
+                      os.path.join(os.path.dirname(sys.path[0]), dir)]
+        for candidate in unique_preserve_order(candidates):
+            if os.path.isdir(candidate):
+                return candidate
+        return None
+
     def find_plugins(self, dir: str):
         """
         Find readers in a given directory. This method
@@ -103,63 +163,108 @@ class Registry(ExtensionRegistry):
         :return: number of readers found
         """
         readers_found = 0
-        temp_path = os.path.abspath(dir)
-        if not os.path.isdir(temp_path):
-            temp_path = os.path.join(os.getcwd(), dir)
-        if not os.path.isdir(temp_path):
-            temp_path = os.path.join(os.path.dirname(__file__), dir)
-        if not os.path.isdir(temp_path):
-            temp_path = os.path.join(os.path.dirname(sys.path[0]), dir)
-
-        dir = temp_path
+        plugin_dir = self._resolve_plugin_dir(dir)
         # Check whether the directory exists
-        if not os.path.isdir(dir):
+        if plugin_dir is None:
             msg = f"DataLoader could nt locate plugin folder. {dir} does not exist"
             logger.warning(msg)
             return readers_found
+        dir = plugin_dir
+
+        # scandir knows which entries are files without a stat call per entry
+        with os.scandir(dir) as entries:
+            files = [entry for entry in entries if entry.is_file()]
+        importers = {'.py': self._import_py_plugin, '.zip': self._import_zip_plugin}
+        for entry in files:
+            importer = importers.get(os.path.splitext(entry.name)[1])
+            if importer is not None:
+                readers_found += importer(entry.path)
+
+        return readers_found
+
+    def _import_py_plugin(self, path: str) -> int:
+        """
+        Register the reader in a python file within a plugin directory.
+        :param path: path to the python file
+        :return: number of readers found
+        """
+        dir, item = os.path.split(path)
+        name = os.path.splitext(item)[0]
+        try:
+            # Plugins imported by an earlier scan are reused without going through the import system
+            module = sys.modules.get(name)
+            if module is None:
+                if sys.path[:1] != [dir]:
+                    sys.path.insert(0, dir)
+                module = importlib.import_module(name)
+            return int(self._identify_plugin(module))
+        except Exception as exc:
+            msg = f"Loader: Error importing {item}\n  {str(exc)}"
+            logger.error(msg)
+        return 0
 
-        for item in os.listdir(dir):
-            full_path = os.path.join(dir, item)
-            if os.path.isfile(full_path):
-
-                # Process python files
-                if item.endswith('.py'):
-                    toks = os.path.splitext(os.path.basename(item))
-                    try:
-                        sys.path.insert(0, os.path.abspath(dir))
-                        module = __import__(toks[0], globals(), locals())
-                        if self._identify_plugin(module):
-                            readers_found += 1
-                    except Exception as exc:
-                        msg = f"Loader: Error importing {item}\n  {str(exc)}"
-                        logger.error(msg)
-
-                # Process zip files
-                elif item.endswith('.zip'):
-                    try:
-                        # Find the modules in the zip file
-                        zfile = ZipFile(item)
-                        nlist = zfile.namelist()
-
-                        sys.path.insert(0, item)
-                        for mfile in nlist:
-                            try:
-                                # Change OS path to python path
-                                fullname = mfile.replace('/', '.')
-                                fullname = os.path.splitext(fullname)[0]
-                                module = __import__(fullname, globals(), locals(), [""])
-                                if self._identify_plugin(module):
-                                    readers_found += 1
-                            except Exception as exc:
-                                msg = f"Loader: Error importing {mfile}\n  {str(exc)}"
-                                logger.error(msg)
-
-                    except Exception as exc:
-                        msg = f"Loader: Error importing  {item}\n  {str(exc)}"
-                        logger.error(msg)
+    def _import_zip_plugin(self, path: str) -> int:
+        """
+        Register the readers in the python modules of a zip file within a plugin directory.
+        :param path: path to the zip file
+        :return: number of readers found
+        """
+        readers_found = 0
+        try:
+            # Find the modules in the zip file, reading its table of contents once
+            with ZipFile(path) as zfile:
+                module_names = self._zip_module_names(zfile.namelist())
+
+            # The import system reads the modules straight from the archive through zipimport
+            if any(fullname not in sys.modules for fullname in module_names):
+                sys.path.insert(0, path)
+            for fullname in module_names:
+                try:
+                    module = sys.modules.get(fullname) or importlib.import_module(fullname)
+                    if self._identify_plugin(module):
+                        readers_found += 1
+                except Exception as exc:
+                    msg = f"Loader: Error importing {fullname}\n  {str(exc)}"
+                    logger.error(msg)
 
+        except Exception as exc:
+            msg = f"Loader: Error importing  {os.path.basename(path)}\n  {str(exc)}"
+            logger.error(msg)
         return readers_found
 
+    @staticmethod
+    def _zip_module_names(file_names: List[str]) -> List[str]:
+        """
+        Find the python modules within a zip file
+        :param file_names: Names of the files in the archive
+        :return: Importable module names, with packages named by their directory
+        """
+        module_names = []
+        for file_name in file_names:
+            if not file_name.endswith('.py'):
+                continue
+            # Change OS path to python path
+            parts = os.path.splitext(file_name)[0].split('/')
+            if parts[-1] == '__init__':
+                parts = parts[:-1]
+            if parts:
+                module_names.append('.'.join(parts))
+        return module_names
+
+    @property
+    def wildcards(self) -> List[str]:
+        """List of wildcards for the registered file types"""
+        return list(self._wildcards)
+
+    def _add_wildcard(self, type_name: str, ext: str):
+        """
+        Keep track of the wildcard for a file type
+        :param type_name: description of the file type
+        :param ext: file extension [string]
+        """
+        ext = ext.lower()
+        self._wildcards[f"{type_name} files (*{ext})|*{ext}"] = None
+
     def associate_file_type(self, ext: str, module: ModuleType) -> bool:
         """
         Look into a module to find whether it contains a
@@ -174,10 +279,9 @@ class Registry(ExtensionRegistry):
             try:
                 # Find supported extensions
                 loader = module.Reader()
-                if ext not in self.readers:
-                    self.readers[ext] = []
-                # Append the new reader to the list
-                self.readers[ext].append(loader.read)
+                # Add the new reader to the list with the lowest priority
+                self.readers[ext] = self.readers.get(ext, ()) + (loader.read,)
+                self._clear_caches()
 
                 reader_found = True
 
@@ -186,14 +290,10 @@ class Registry(ExtensionRegistry):
                 if hasattr(loader, 'type_name'):
                     type_name = loader.type_name
 
-                wcard = f"{type_name} files (*{ext.lower()})|*{ext.lower()}"
-                if wcard not in self.wildcards:
-                    self.wildcards.append(wcard)
+                self._add_wildcard(type_name, ext)
 
                 # Check whether writing is supported
                 if hasattr(loader, 'write'):
-                    if ext not in self.writers:
-                        self.writers[ext] = []
                     # Append the new writer to the list
                     self.writers[ext].append(loader.write)
 
@@ -212,10 +312,9 @@ class Registry(ExtensionRegistry):
 
         try:
             # Find supported extensions
-            if file_extension not in self.readers:
-                self.readers[file_extension] = []
-            # Append the new reader to the list
-            self.readers[file_extension].append(reader.read)
+            # Add the new reader to the list with the lowest priority
+            self.readers[file_extension] = self.readers.get(file_extension, ()) + (reader.read,)
+            self._clear_caches()
 
             reader_found = True
 
@@ -223,9 +322,7 @@ class Registry(ExtensionRegistry):
             if hasattr(reader, 'type_name'):
                 type_name = reader.type_name
 
-                wcard = f"{type_name} files (*{file_extension.lower()})|*{file_extension.lower()}"
-                if wcard not in self.wildcards:
-                    self.wildcards.append(wcard)
+                self._add_wildcard(type_name, file_extension)
 
         except Exception as exc:
             msg = f"Loader: Error accessing Reader in {reader.__name__}\n  {str(exc)}"
@@ -246,27 +343,22 @@ class Registry(ExtensionRegistry):
             try:
                 # Find supported extensions
                 reader = module.Reader()
+                file_description = reader.type_name if hasattr(reader, 'type_name') else module.__name__
+                # Check whether writing is supported
+                writer = getattr(reader, 'write', None)
                 for ext in reader.ext:
-                    if ext not in self.readers:
-                        self.readers[ext] = []
                     # When finding a reader at run time,
                     # treat this reader as the new default
-                    self.readers[ext].insert(0, reader.read)
+                    self.readers[ext] = (reader.read,) + self.readers.get(ext, ())
+                    self._clear_caches()
 
                     reader_found = True
 
                     # Keep track of wildcards
-                    file_description = reader.type_name if hasattr(reader, 'type_name') else module.__name__
-                    wcard = f"{file_description} files (*{ext.lower()})|*{ext.lower()}"
-                    if wcard not in self.wildcards:
-                        self.wildcards.append(wcard)
+                    self._add_wildcard(file_description, ext)
 
-                # Check whether writing is supported
-                if hasattr(reader, 'write'):
-                    for ext in reader.ext:
-                        if ext not in self.writers:
-                            self.writers[ext] = []
-                        self.writers[ext].insert(0, reader.write)
+                    if writer is not None:
+                        self.writers[ext].insert(0, writer)
 
             except Exception as exc:
                 msg = f"Loader: Error accessing Reader in {module.__name__}\n {str(exc)}"
@@ -278,16 +370,13 @@ class Registry(ExtensionRegistry):
         :return: the loader associated with the file type of path.
         :Raises ValueError: if file type is not known.
         """
-        # Find matching extensions
-        extlist = [ext for ext in self.extensions() if path.endswith(ext)]
-
-        # Sort matching extensions by decreasing order of length
-        extlist.sort(key=len)
-
-        # Combine loaders for matching extensions into one big list
-        writers = [writer for ext in extlist for writer in self.writers[ext]]
-        # Remove duplicates if they exist
-        writers = unique_preserve_order(writers)
+        # Use the writers for the most specific matching extension, e.g. '.tar.gz' rather than '.gz'
+        writers = []
+        for ext in reversed(self._matching_extensions(self._file_name(path))):
+            if self.writers.get(ext):
+                # Remove duplicates if they exist
+                writers = unique_preserve_order(self.writers[ext])
+                break
         # Raise an error if there are no matching extensions
         if len(writers) == 0:
             raise ValueError("Unknown file type for " + path)
@@ -305,9 +394,17 @@ class Registry(ExtensionRegistry):
             writers = self.lookup_writers(path)
         else:
             writers = self.writers[format]
+        # Keying on the writers themselves means registering a writer can never leave a stale entry behind
+        key = tuple(writers)
+        # Try the writer that succeeded for the last file of this type first, keeping the others in priority order
+        winner = self._writer_winner.get(key)
+        if winner is not None:
+            writers = [winner] + [writer for writer in writers if writer != winner]
         for writing_function in writers:
             try:
-                return writing_function(path, data)
+                result = writing_function(path, data)
+                self._writer_winner[key] = writing_function
+                return result
             except Exception as exc:
                 msg = f"Saving file {path} using the {type(writing_function).__name__} writer failed.\n {str(exc)}"
                 logger.exception(msg)  # give other loaders a chance to succeed
@@ -357,6 +454,12 @@ class Loader:
         """
         return self.__registry.save(file, data, format)
 
+    def clear_cache(self):
+        """
+        Forget all previously loaded data so the next load of any file reads it from disk
+        """
+        self.__registry.clear_cache()
+
     def _get_registry_creation_time(self) -> float:
         """
         Internal method used to test the uniqueness
@@ -16,6 +16,8 @@ import logging
 import os
 from typing import Optional
 
+import numpy as np
+
 from sasdata.dataloader.filereader import FileReader
 from sasdata.dataloader.data_info import DataInfo, plottable_1D
 from sasdata.data_util.loader_exceptions import FileContentsException, DefaultReaderException
@@ -70,7 +72,7 @@ class Reader(FileReader):
         line_no = 0
         # minimum required number of columns of data
         lentoks = 2
-        for line in lines:
+        for line_index, line in enumerate(lines):
             toks = self.splitline(line.strip())
             # To remember the number of columns in the current line of data
             new_lentoks = len(toks)
@@ -118,6 +120,18 @@ class Reader(FileReader):
                 # for the next line of data
                 lentoks = new_lentoks
                 line_no += 1
+
+                if is_data and candidate_lines == self.min_data_pts:
+                    # Once the data block is found, parse the rest of it in one pass. A footer or any other
+                    # line that doesn't fit makes this fail, in which case the lines are read one at a time.
+                    try:
+                        block = self.parse_columns(lines[line_index + 1:], self.delimiter(line.strip()))
+                    except ValueError:
+                        block = None
+                    if block is not None and (len(block) == 0 or block.shape[1] == lentoks):
+                        self._store_data_block(block, candidate_lines)
+                        candidate_lines += len(block)
+                        break
             except ValueError:
                 # ValueError is raised when non numeric strings conv. to float
                 # It is data and meet non - number, then stop reading
@@ -164,6 +178,16 @@ class Reader(FileReader):
         self.current_datainfo.meta_data['loader'] = self.type_name
         self.send_to_output()
 
+    def _store_data_block(self, block: np.ndarray, start: int):
+        """
+        Copy the columns of a parsed block of data into the current data set
+        :param block: 2D array of data with one row per point, in the column order x, y, dy, dx
+        :param start: Index of the data set to store the first row at
+        """
+        end = start + len(block)
+        for column, name in zip(block.T, ('x', 'y', 'dy', 'dx')):
+            getattr(self.current_dataset, name)[start:end] = column
+
     def write(self, filename: str, dataset: plottable_1D, sep: Optional[str] = " "):
         """
         Output data in ascii or similar format, depending on the separator provided
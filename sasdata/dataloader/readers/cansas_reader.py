@@ -1,5 +1,6 @@
 import logging
 import os
+import re
 import datetime
 import inspect
 from inspect import FrameInfo
@@ -58,6 +59,8 @@ class Reader(XMLreader):
     ext = ['.xml', '.svs']
     # Flag to bypass extension check
     allow_all = True
+    # XML documents start with a tag, after an optional byte order mark and whitespace
+    signature = re.compile(rb'(\xef\xbb\xbf|\xff\xfe|\xfe\xff)?[\s\x00]*<')
 
     def reset_state(self):
         """
@@ -71,6 +74,9 @@ class Reader(XMLreader):
         self.aperture = Aperture()
         self.collimation = Collimation()
         self.detector = Detector()
+        # Data points read for the current data set and transmission spectrum, by attribute name
+        self.data_points = {}
+        self.trans_points = {}
         self.names = []
         self.cansas_defaults = {}
         self.ns_list = None
@@ -298,6 +304,7 @@ class Reader(XMLreader):
             self.current_datainfo.errors = set()
             for error in self.errors:
                 self.current_datainfo.errors.add(error)
+            self._store_points(self.current_dataset, self.data_points)
             self.data_cleanup()
             self.sort_data()
             self.reset_data_list()
@@ -314,18 +321,18 @@ class Reader(XMLreader):
         """
         if tagname == 'I' and isinstance(self.current_dataset, plottable_1D):
             self.current_dataset.yaxis("Intensity", unit)
-            self.current_dataset.y = np.append(self.current_dataset.y, data_point)
+            self.data_points.setdefault('y', []).append(data_point)
         elif tagname == 'Idev' and isinstance(self.current_dataset, plottable_1D):
-            self.current_dataset.dy = np.append(self.current_dataset.dy, data_point)
+            self.data_points.setdefault('dy', []).append(data_point)
         elif tagname == 'Q':
             self.current_dataset.xaxis("Q", unit)
-            self.current_dataset.x = np.append(self.current_dataset.x, data_point)
+            self.data_points.setdefault('x', []).append(data_point)
         elif tagname == 'Qdev':
-            self.current_dataset.dx = np.append(self.current_dataset.dx, data_point)
+            self.data_points.setdefault('dx', []).append(data_point)
         elif tagname == 'dQw':
-            self.current_dataset.dxw = np.append(self.current_dataset.dxw, data_point)
+            self.data_points.setdefault('dxw', []).append(data_point)
         elif tagname == 'dQl':
-            self.current_dataset.dxl = np.append(self.current_dataset.dxl, data_point)
+            self.data_points.setdefault('dxl', []).append(data_point)
         elif tagname == 'Qmean':
             pass
         elif tagname == 'Shadowfactor':
@@ -579,13 +586,13 @@ class Reader(XMLreader):
         :return: None
         """
         if tagname == 'T':
-            self.transspectrum.transmission = np.append(self.transspectrum.transmission, data_point)
+            self.trans_points.setdefault('transmission', []).append(data_point)
             self.transspectrum.transmission_unit = unit
         elif tagname == 'Tdev':
-            self.transspectrum.transmission_deviation = np.append(self.transspectrum.transmission_deviation, data_point)
+            self.trans_points.setdefault('transmission_deviation', []).append(data_point)
             self.transspectrum.transmission_deviation_unit = unit
         elif tagname == 'Lambda':
-            self.transspectrum.wavelength = np.append(self.transspectrum.wavelength, data_point)
+            self.trans_points.setdefault('wavelength', []).append(data_point)
             self.transspectrum.wavelength_unit = unit
         else:
             self.process_meta_data(tagname, data_point)
@@ -626,6 +633,7 @@ class Reader(XMLreader):
             self.current_datainfo.detector.append(self.detector)
             self.detector = Detector()
         elif self.parent_class == 'SAStransmission_spectrum':
+            self._store_points(self.transspectrum, self.trans_points)
             self.current_datainfo.trans_spectrum.append(self.transspectrum)
             self.transspectrum = TransmissionSpectrum()
         elif self.parent_class == 'SAScollimation':
@@ -635,8 +643,22 @@ class Reader(XMLreader):
             self.collimation.aperture.append(self.aperture)
             self.aperture = Aperture()
         elif self.parent_class == 'SASdata':
+            self._store_points(self.current_dataset, self.data_points)
             self.data.append(self.current_dataset)
 
+    @staticmethod
+    def _store_points(storage, points: dict):
+        """
+        Add the data points read for an object to its arrays. Points are collected in lists while the XML is parsed
+        and appended here in one go, rather than growing the arrays one point at a time.
+
+        :param storage: The data set or transmission spectrum the points belong to
+        :param points: Lists of data points by attribute name, emptied once stored
+        """
+        for name, values in points.items():
+            setattr(storage, name, np.append(getattr(storage, name), values))
+        points.clear()
+
     def _get_node_value(self, node: ElementTree, tagname: str):
         """
         Get the value of a node and any applicable units
@@ -7,17 +7,16 @@ import h5py
 import numpy as np
 import re
 import os
-import traceback
 from typing import Any, Union, Optional
 
 from sasdata.dataloader.data_info import plottable_1D, plottable_2D, Data1D, Data2D, DataInfo, Process, Aperture,\
     Collimation, TransmissionSpectrum, Detector
 from sasdata.data_util.loader_exceptions import FileContentsException, DefaultReaderException
+from sasdata.data_util.registry import is_hdf5
 from sasdata.dataloader.filereader import FileReader, decode
 
 logger = logging.getLogger(__name__)
 
-
 def h5attr(node, key, default=None):
     value = node.attrs.get(key, default)
     if isinstance(value, np.ndarray) and value.dtype.char == 'S':
@@ -56,6 +55,15 @@ class Reader(FileReader):
     # Flag to bypass extension check
     allow_all = True
 
+    def accepts(self, file_handler) -> bool:
+        """
+        Check for the HDF5 signature, which can sit after a user block rather than at the start of the file.
+
+        :param file_handler: A CustomFileOpen instance used to handle file operations
+        :return: False if the file is not an HDF5 file
+        """
+        return is_hdf5(file_handler.fd)
+
     def get_file_contents(self):
         """
         This is the general read method that all SasView data_loaders must have.
@@ -67,12 +75,17 @@ class Reader(FileReader):
         self.reset_state()
 
         try:
-            # Only create h5py object
-            with h5py.File(self.f_open, 'r') as hdf_open:
-                # Read in all child elements of top level SASroot
-                self.read_children(hdf_open, [])
-                # Add the last data set to the list of outputs
-                self.add_data_set()
+            # The h5py object is opened once per file handle and closed by the file handler
+            hdf_open = self.file_handler.h5_fd
+        except Exception as exc:
+            raise FileContentsException(exc)
+        if hdf_open is None:
+            raise FileContentsException(f"{self.filepath} is not an HDF5 file.")
+        try:
+            # Read in all child elements of top level SASroot
+            self.read_children(hdf_open, [])
+            # Add the last data set to the list of outputs
+            self.add_data_set()
         except Exception as exc:
             raise FileContentsException(exc)
         for data_set in self.output:
@@ -147,7 +160,7 @@ class Reader(FileReader):
                     self.add_intermediate()
                 except Exception as e:
                     self.current_datainfo.errors.append(str(e))
-                    logger.debug(traceback.format_exc())
+                    logger.debug("Error reading HDF5 group %s", key, exc_info=True)
                 # Reset parent class when returning from recursive method
                 self.parent_class = last_parent_class
                 parent_list.remove(key)
@@ -89,7 +89,7 @@ class XMLreader(FileReader):
                 # File or URL object
                 self._set_xml_file(xml)
             elif uri_is_valid(xml):
-                self._set_xml_uri()
+                self._set_xml_uri(xml)
             else:
                 # XML string
                 self._set_xml_string(xml)
@@ -120,13 +120,17 @@ class XMLreader(FileReader):
         self.xmldoc = etree.fromstring(tag_soup)
         self.xmlroot = self.xmldoc
 
-    def _set_xml_uri(self) -> None:
+    def _set_xml_uri(self, uri: str) -> None:
         """
-        Set a URI as the working XML.
+        Set a URI as the working XML. The local copy of the remote file is parsed
+        directly, leaving lxml to decode it using the encoding the document declares.
 
         :param uri: URI formatted string
         """
-        self._set_xml_string(self.readall())
+        self.xml = uri
+        self.f_open.seek(self.f_pos)
+        self.xmldoc = etree.parse(self.f_open, parser=PARSER)
+        self.xmlroot = self.xmldoc.getroot()
 
     def set_schema(self, schema):
         """
@@ -5,7 +5,7 @@ import os
 import unittest
 import logging
 import warnings
-from io import StringIO
+from io import BytesIO, StringIO
 
 from lxml import etree
 from lxml.etree import XMLSyntaxError
@@ -17,6 +17,7 @@ from sasdata.dataloader.data_info import Data1D, Data2D
 from sasdata.dataloader.readers.xml_reader import XMLreader
 from sasdata.dataloader.readers.cansas_reader import Reader
 from sasdata.dataloader.readers.cansas_constants import CansasConstants
+from sasdata.data_util.registry import HDF5_SIGNATURE, is_hdf5
 
 logger = logging.getLogger(__name__)
 
@@ -518,6 +519,16 @@ class cansas_reader_hdf5(unittest.TestCase):
         self.assertTrue(dataset.err_data is None)
         self.assertTrue(dataset.q_data is not None)
 
+    def test_hdf5_signature(self):
+        with open(self.datafile_basic, 'rb') as hdf_file:
+            hdf_file.seek(10)
+            self.assertTrue(is_hdf5(hdf_file))
+            self.assertEqual(hdf_file.tell(), 10)
+        self.assertTrue(is_hdf5(BytesIO(bytes(1024) + HDF5_SIGNATURE)))
+        self.assertFalse(is_hdf5(BytesIO(bytes(100) + HDF5_SIGNATURE)))
+        with open(find("cansas_test.xml"), 'rb') as xml_file:
+            self.assertFalse(is_hdf5(xml_file))
+
     def test_multiple_sasentries(self):
         self.data = self.loader.load(self.datafile_multiplesasentry)
         self.assertTrue(len(self.data) == 2)
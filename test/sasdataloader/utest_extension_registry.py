@@ -5,16 +5,35 @@
 import logging
 import unittest
 import os
+import re
 import shutil
+import sys
+import tempfile
 import numpy as np
+from pathlib import Path
+from zipfile import ZipFile
 
 from sasdata.dataloader.loader import Registry as Loader
 from sasdata.dataloader.loader import Loader as LoaderMain
+from sasdata.data_util.registry import ExtensionRegistry
+from sasdata.dataloader.filereader import FileReader
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = 'https://github.com/SasView/sasdata/raw/master/test/sasdataloader/data/'
 
+PLUGIN_SOURCE = """
+class Reader:
+    type_name = "Registry test plugin"
+    ext = ['.plg']
+
+    def read(self, path, handle=None):
+        return []
+
+    def write(self, path, data):
+        pass
+"""
+
 
 def find(filename):
     return os.path.join(os.path.dirname(__file__), 'data', filename)
@@ -131,6 +150,13 @@ class ExtensionRegistryTests(unittest.TestCase):
         # Ensure the string representation of the file contents match
         self.assertEqual(str(local_pdh[0]), str(remote_pdh[0]))
 
+    def test_compare_file_uri_to_local(self):
+        """Load the same file from a local path and a file:// URI and compare data objects."""
+        for local_file in [self.valid_txt_file, self.valid_hdf_file, self.valid_dat_file]:
+            local_data = self.loader.load(local_file)
+            uri_data = self.loader.load(Path(local_file).resolve().as_uri())
+            self.assertEqual(str(local_data[0]), str(uri_data[0]))
+
     def test_load_simultaneously(self):
         """Load a list of files, not just a single file, and ensure the content matches"""
         loader = LoaderMain()
@@ -142,6 +168,191 @@ class ExtensionRegistryTests(unittest.TestCase):
         for file in all_files:
             self.assertTrue(str(file) in strings)
 
+    def test_repeat_load_cached(self):
+        """Loading an unchanged file again returns an independent copy of the cached data"""
+        first = self.loader.load(self.valid_txt_file)
+        first[0].y *= 2
+        second = self.loader.load(self.valid_txt_file)
+        self.assertIsNot(first[0], second[0])
+        self.assertTrue(np.all(first[0].y == 2 * second[0].y))
+        self.assertEqual(len(self.loader._load_cache), 1)
+        self.loader.clear_cache()
+        self.assertEqual(len(self.loader._load_cache), 0)
+        # Registering a reader forgets data read by the readers registered before
+        self.loader.load(self.valid_txt_file)
+        self.loader['.cx'] = lambda path, handle: []
+        self.assertEqual(len(self.loader._load_cache), 0)
+
+    def test_lookup_multiple_dot_extensions(self):
+        """Readers registered for compound and simple extensions are both found for a compound extension"""
+        registry = ExtensionRegistry()
+
+        def gunzip(path, handle):
+            return []
+
+        def untar(path, handle):
+            return []
+
+        registry['.gz'] = gunzip
+        registry['.tar.gz'] = untar
+        readers = registry.lookup(os.path.join('some.dir', 'data.TAR.GZ'))
+        self.assertIn(gunzip, readers)
+        self.assertIn(untar, readers)
+        self.assertEqual(registry.lookup(Path('some.dir', 'data.TAR.GZ'))[:2], readers[:2])
+        self.assertNotIn(gunzip, registry.lookup(os.path.join('data.gz', 'file')))
+        readers = registry.lookup('data.gz')
+        self.assertIn(gunzip, readers)
+        self.assertNotIn(untar, readers)
+        # Readers registered after a lookup are found by later lookups
+        registry['.tar.gz'] = gunzip
+        registry['.gz'] = untar
+        self.assertEqual(registry.lookup('data.tar.gz')[:2], [untar, gunzip])
+        self.assertEqual(registry.lookup('data.gz')[:2], [untar, gunzip])
+
+    def test_fallback_readers_reused(self):
+        """The generic fallback readers are created once and shared by every lookup"""
+        registry = ExtensionRegistry()
+        fallback = registry.lookup('hello.xyz')
+        self.assertTrue(fallback)
+        self.assertEqual(registry.lookup('other.abc'), fallback)
+
+    def test_lookup_writers(self):
+        """Writers are found for the extension of the file name only"""
+        writers = self.loader.lookup_writers(os.path.join('some.dir', 'data.xml'))
+        self.assertEqual(writers, self.loader.writers['.xml'])
+        self.assertEqual(self.loader.lookup_writers('data.tar.xml'), writers)
+        self.assertRaises(ValueError, self.loader.lookup_writers, os.path.join('data.xml', 'file'))
+        self.assertRaises(ValueError, self.loader.lookup_writers, 'data.xyz')
+        # Writers for the most specific extension are used
+        def write_tar_xml(path, data):
+            pass
+        self.loader['.tar.xml'] = lambda path, handle: []
+        self.loader.writers['.tar.xml'] = [write_tar_xml]
+        self.assertEqual(self.loader.lookup_writers('data.tar.xml'), [write_tar_xml])
+
+    def test_successful_writer_tried_first(self):
+        """The writer that last saved a file type is tried first"""
+        calls = []
+
+        def failing(path, data):
+            calls.append(failing)
+            raise ValueError("Cannot write this data")
+
+        def succeeding(path, data):
+            calls.append(succeeding)
+            return path
+
+        self.loader.writers['.wrt'] = [failing, succeeding]
+        self.assertEqual(self.loader.save('first.wrt', None, '.wrt'), 'first.wrt')
+        self.assertEqual(self.loader.save('second.wrt', None, '.wrt'), 'second.wrt')
+        self.assertEqual(calls, [failing, succeeding, succeeding])
+        # A new writer list starts again from its own priority order
+        self.loader.writers['.wrt'].insert(0, succeeding)
+        self.loader.save('third.wrt', None, '.wrt')
+        self.assertEqual(calls[-1], succeeding)
+        self.assertEqual(len(calls), 4)
+
+    def test_find_plugins(self):
+        """Readers in python files within a plugin directory are registered as the default for their extensions"""
+        plugin_dir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(plugin_dir, 'registry_test_plugin.py'), 'w') as plugin:
+                plugin.write(PLUGIN_SOURCE)
+            os.mkdir(os.path.join(plugin_dir, 'not_a_plugin.py'))
+            # Zipped plugins can be packages
+            with ZipFile(os.path.join(plugin_dir, 'plugins.zip'), 'w') as archive:
+                archive.writestr('registry_test_package/__init__.py', '')
+                archive.writestr('registry_test_package/zipped.py', PLUGIN_SOURCE.replace('.plg', '.zpl'))
+                archive.writestr('registry_test_package/README.txt', 'Not a module')
+            self.assertEqual(self.loader.find_plugins(plugin_dir), 2)
+            self.assertEqual(self.loader.lookup('data.plg')[0].__self__.type_name, "Registry test plugin")
+            self.assertEqual(self.loader.lookup('data.zpl')[0].__self__.type_name, "Registry test plugin")
+            self.assertEqual(self.loader.lookup_writers('data.plg')[0].__self__.type_name, "Registry test plugin")
+            # Plugins imported by an earlier scan are reused without touching the import path
+            path_length = len(sys.path)
+            self.assertEqual(self.loader.find_plugins(plugin_dir), 2)
+            self.assertEqual(len(sys.path), path_length)
+            # Each file type is listed once however often it is registered
+            self.assertEqual(self.loader.wildcards.count("Registry test plugin files (*.plg)|*.plg"), 1)
+            self.assertEqual(self.loader.find_plugins(os.path.join(plugin_dir, 'missing')), 0)
+        finally:
+            shutil.rmtree(plugin_dir)
+
+    def test_most_recent_reader_first(self):
+        """The most recently registered reader for an extension is tried first"""
+        registry = ExtensionRegistry()
+        cx_readers = [lambda path, handle: [] for _ in range(3)]
+        for reader in cx_readers:
+            registry['.cx'] = reader
+        self.assertEqual(registry['.cx'], cx_readers[::-1])
+        self.assertEqual(registry.lookup('hello.cx')[:3], cx_readers[::-1])
+
+    def test_successful_reader_tried_first(self):
+        """The reader that last loaded a file type is tried first, until a new reader is registered"""
+        registry = ExtensionRegistry()
+        calls = []
+
+        def failing(path, handle):
+            calls.append(failing)
+            raise ValueError("Not a cx file")
+
+        def working(path, handle):
+            calls.append(working)
+            return ['data']
+
+        registry['.cx'] = working
+        registry['.cx'] = failing
+        self.assertEqual(registry.load(self.valid_txt_file, '.cx'), ['data'])
+        self.assertEqual(calls, [failing, working])
+        calls.clear()
+        registry.clear_cache()
+        registry.load(self.valid_txt_file, '.CX')
+        self.assertEqual(calls, [working])
+        calls.clear()
+        registry.clear_cache()
+
+        def newest(path, handle):
+            calls.append(newest)
+            return ['new data']
+
+        registry['.cx'] = newest
+        self.assertEqual(registry.load(self.valid_txt_file, '.cx'), ['new data'])
+        self.assertEqual(calls, [newest])
+
+    def test_signature_mismatch_skips_reader(self):
+        """Readers with a signature the file does not match are skipped without being called"""
+        class XMLOnly(FileReader):
+            type_name = "XML only"
+            signature = re.compile(rb'\s*<')
+
+            def read(self, path, handle):
+                raise AssertionError("Reader called for a file not matching its signature")
+
+        registry = ExtensionRegistry()
+        registry['.txt'] = XMLOnly().read
+        data = registry.load(self.valid_txt_file, '.txt')
+        self.assertEqual(len(data[0].errors), 1)
+        self.assertIn("is not a XML only file", str(data[0].errors[0]))
+
+    def test_registered_extensions_and_formats(self):
+        """Registered extensions and formats are reported, including those added after a previous query"""
+        registry = ExtensionRegistry()
+        registry['.cx'] = lambda path, handle: []
+        registry['cx3'] = lambda path, handle: []
+        self.assertEqual(registry.extensions(), ['.cx'])
+        self.assertEqual(registry.formats(), ['cx3'])
+        registry['.ab'] = lambda path, handle: []
+        registry['cx1'] = lambda path, handle: []
+        self.assertEqual(registry.extensions(), ['.ab', '.cx'])
+        self.assertEqual(registry.formats(), ['cx1', 'cx3'])
+
+    def test_unknown_extension_not_registered(self):
+        """Looking up an unregistered extension must not register it"""
+        registry = ExtensionRegistry()
+        self.assertEqual(registry['.xyz'], [])
+        self.assertNotIn('.xyz', registry)
+        self.assertEqual(registry.extensions(), [])
+
     def tearDown(self):
         if os.path.isfile(self.valid_file_wrong_known_ext):
             os.remove(self.valid_file_wrong_known_ext)
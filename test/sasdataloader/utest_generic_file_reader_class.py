@@ -7,7 +7,7 @@ import unittest
 import logging
 import numpy as np
 
-from sasdata.dataloader.data_info import DataInfo, plottable_1D, Data1D
+from sasdata.dataloader.data_info import DataInfo, plottable_1D, Data1D, Data2D
 from sasdata.dataloader.loader import Loader
 from sasdata.dataloader.filereader import FileReader
 
@@ -77,6 +77,74 @@ class GenericFileReaderTests(unittest.TestCase):
         f_call = Loader()([xml_native])[0]
         self.assertEqual(str(f_call), str(f_load))
 
+    def test_remove_nans(self):
+        data = Data1D(x=np.array([1., 2., 3., 4.]), y=np.array([1., np.nan, 3., 4.]),
+                      dy=np.array([.1, .2, np.inf, .4]))
+        data = FileReader._remove_nans_in_data(data)
+        np.testing.assert_array_equal(data.x, [1., 4.])
+        np.testing.assert_array_equal(data.dy, [.1, .4])
+        data = Data2D(data=np.array([1., 2., 3.]), err_data=np.array([.1, np.nan, .3]),
+                      qx_data=np.array([.1, .2, .3]), qy_data=np.array([.1, .2, .3]),
+                      q_data=np.array([.1, .2, .3]), mask=np.array([True, False, True]))
+        data = FileReader._remove_nans_in_data(data)
+        np.testing.assert_array_equal(data.data, [1., 3.])
+        np.testing.assert_array_equal(data.mask, [True, True])
+
+    def test_sort_data(self):
+        unsorted = Data1D(x=np.array([3., 1., 2., 1.]), y=np.array([1., 4., 3., 2.]), dy=np.array([.1, .4, .3, .2]))
+        ordered = Data1D(x=np.array([1., 2., 3.]), y=np.array([3., 2., 1.]))
+        self.reader.output = [unsorted, ordered]
+        x = ordered.x
+        self.reader.sort_data()
+        # Points are ordered by x, and points with the same x by y
+        np.testing.assert_array_equal(unsorted.x, [1., 1., 2., 3.])
+        np.testing.assert_array_equal(unsorted.y, [2., 4., 3., 1.])
+        np.testing.assert_array_equal(unsorted.dy, [.2, .4, .3, .1])
+        np.testing.assert_array_equal(ordered.y, [3., 2., 1.])
+        self.assertIsNot(ordered.x, x)
+
+    def test_remove_empty_q_values(self):
+        self.reader.current_dataset = plottable_1D(np.array([0., 1., 2.]), np.array([3., 4., 5.]))
+        self.reader.remove_empty_q_values()
+        dataset = self.reader.current_dataset
+        np.testing.assert_array_equal(dataset.x, [1., 2.])
+        np.testing.assert_array_equal(dataset.y, [4., 5.])
+        # Missing resolutions are filled with zeros for every point
+        np.testing.assert_array_equal(dataset.dx, [0., 0.])
+        np.testing.assert_array_equal(dataset.dy, [0., 0.])
+        self.assertEqual(dataset.dy.dtype, np.float64)
+
+    def test_convert_data_units(self):
+        x = np.array([1., 2.])
+        dx = np.array([0.1, 0.2])
+        first = Data1D(x=x, y=np.array([3., 4.]), dx=dx)
+        second = Data1D(x=x, y=np.array([5., 6.]))
+        third = Data1D(x=x, y=np.array([7., 8.]))
+        for dataset in (first, second, third):
+            dataset.xaxis("\\rm{Q}", "1/nm")
+        # Files with more than two data sets are converted in parallel
+        for output in ([first, second], [third, second, first]):
+            x[:] = [1., 2.]
+            dx[:] = [0.1, 0.2]
+            self.reader.output = output
+            self.reader.convert_data_units()
+            # An array shared between data sets is only converted once
+            for dataset in output:
+                np.testing.assert_allclose(dataset.x, [0.1, 0.2])
+                dataset.xaxis("\\rm{Q}", "1/nm")
+        np.testing.assert_allclose(first.dx, [0.01, 0.02])
+        self.assertEqual(first.x_unit, "1/A")
+
+    def test_parse_columns(self):
+        self.assertEqual(FileReader.delimiter("1, 2; 3"), ",")
+        self.assertEqual(FileReader.delimiter("1; 2 3"), ";")
+        self.assertIsNone(FileReader.delimiter("1 2 3"))
+        block = FileReader.parse_columns(["1, 2", "", " 3 ,4 "], ",")
+        np.testing.assert_array_equal(block, [[1., 2.], [3., 4.]])
+        self.assertEqual(FileReader.parse_columns(["", " "]).shape, (0, 0))
+        self.assertRaises(ValueError, FileReader.parse_columns, ["1 2", "3"])
+        self.assertRaises(ValueError, FileReader.parse_columns, ["1 2", "end of data"])
+
     def check_unknown_extension(self, data):
         self.assertTrue(isinstance(data, Data1D))
         self.assertEqual(len(data.x), 138)
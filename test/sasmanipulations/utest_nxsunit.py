@@ -3,6 +3,8 @@
 """
 import unittest
 
+import numpy as np
+
 from sasdata.data_util.nxsunit import Converter, standardize_units
 
 
@@ -124,3 +126,39 @@ class NXSUnitTests(unittest.TestCase):
                          ['A^{2}', 'B^{2}', 'C^{-2}'])
         # Multiple divisions
         self.assertEqual(standardize_units('A/B/C'), ['A', 'B^{-1}', 'C^{-1}'])
+        # Braced exponents in the denominator
+        self.assertEqual(standardize_units('1/A^{2}'), ['A^{-2}'])
+
+    def test_standardize_units_returns_copy(self):
+        # Mutating a returned list must not affect subsequent (cached) results
+        units = standardize_units('nm^-1')
+        units.append('junk')
+        self.assertEqual(['nm^{-1}'], standardize_units('nm^-1'))
+
+    def test_compatible_units(self):
+        units = Converter('m').get_compatible_units()
+        # Each standardized unit appears exactly once, sorted by increasing scale
+        self.assertEqual(len(units), len(set(tuple(u) for u in units)))
+        self.assertIn(['m'], units)
+        self.assertLess(units.index(['nm']), units.index(['m']))
+        self.assertLess(units.index(['m']), units.index(['km']))
+
+    def test_ambiguous_dimensions(self):
+        # Ambiguous units are resolved per unit, even when combined with other units
+        self.assertEqual(['distance', 'time'], Converter('A s').dimension)
+        self.assertEqual(['temperature'], Converter('C').dimension)
+
+    def test_convert_into_buffer(self):
+        values = np.array([1.0, 2.0, 3.0])
+        # Pure scaling, in place
+        out = Converter('nm')(values.copy(), 'A', out=values)
+        self.assertIs(out, values)
+        np.testing.assert_allclose([10.0, 20.0, 30.0], values)
+        # Scaling with an offset
+        out = np.empty(3)
+        Converter('K')(np.zeros(3), '℃', out=out)
+        np.testing.assert_allclose([-273.15] * 3, out)
+        # No conversion still fills the buffer
+        out = np.empty(3)
+        Converter('m')(values, out=out)
+        np.testing.assert_array_equal(values, out)